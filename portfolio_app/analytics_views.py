@@ -209,6 +209,8 @@ def sync_analytics_data(request):
                 sync_manager.sync_newsletter_analytics()
             elif sync_type == 'services':
                 sync_manager.sync_trading_service_analytics()
+            elif sync_type == 'behavior':
+                sync_manager.sync_behavior_rollup()
         
         return Response({
             'success': True,
@@ -0,0 +1,34 @@
+"""
+Django management command to seed sample blog posts and courses
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from portfolio_app.sample_data import create_sample_blog_data, create_sample_courses
+
+SEEDERS = {
+    'blog': create_sample_blog_data,
+    'courses': create_sample_courses,
+}
+
+class Command(BaseCommand):
+    help = 'Seed sample blog posts and courses in a single transaction'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only',
+            type=str,
+            choices=list(SEEDERS),
+            help='Seed only this dataset'
+        )
+
+    def handle(self, *args, **options):
+        only = options['only']
+        seeders = [SEEDERS[only]] if only else list(SEEDERS.values())
+
+        self.stdout.write(f"Seeding sample {only or 'data'}...")
+
+        with transaction.atomic():
+            for seeder in seeders:
+                seeder()
+
+        self.stdout.write(self.style.SUCCESS('Sample data seeded successfully'))
@@ -0,0 +1,22 @@
+"""
+Prometheus metrics endpoint backed by the SQLAlchemy analytics service
+"""
+from django.http import Http404, HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+import hmac
+import os
+
+def prometheus_metrics(request):
+    """Dashboard metrics in Prometheus text format (requires METRICS_TOKEN bearer auth)"""
+    # Imported lazily so URL loading doesn't open the TiDB engine
+    from database.metrics import registry
+    
+    token = os.getenv('METRICS_TOKEN', '')
+    if not token:
+        raise Http404
+    
+    supplied = request.META.get('HTTP_AUTHORIZATION', '').removeprefix('Bearer ')
+    if not hmac.compare_digest(supplied.encode(), token.encode()):
+        return HttpResponse(status=401)
+    
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_app', '0011_payment_razorpay_order_id_alter_payment_payment_type_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='blogpost',
+            name='portfolio_a_status_64fc4f_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='blogpost',
+            name='portfolio_a_is_feat_71ffbc_idx',
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('status', 'published')), fields=['-publish_date'], name='blogpost_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('is_featured', True), ('status', 'published')), fields=['-publish_date'], name='blogpost_featured_idx'),
+        ),
+    ]
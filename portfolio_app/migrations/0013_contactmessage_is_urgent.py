@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_app', '0012_blogpost_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactmessage',
+            name='is_urgent',
+            field=models.GeneratedField(db_persist=True, expression=models.ExpressionWrapper(models.Q(('priority__in', ['high', 'urgent'])), output_field=models.BooleanField()), output_field=models.BooleanField()),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['is_urgent', '-created_at'], name='contact_urgent_created_idx'),
+        ),
+    ]
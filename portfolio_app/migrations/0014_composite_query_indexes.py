@@ -0,0 +1,47 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_app', '0013_contactmessage_is_urgent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='purchasedcourse',
+            index=models.Index(fields=['user', 'status', '-purchase_date'], name='purchase_user_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workshop',
+            index=models.Index(fields=['is_active', '-start_date'], name='workshop_active_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workshop',
+            index=models.Index(fields=['is_active', 'status', 'start_date'], name='workshop_active_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workshopapplication',
+            index=models.Index(fields=['workshop', '-applied_at'], name='application_workshop_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicebooking',
+            index=models.Index(fields=['service', '-created_at'], name='booking_service_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicebooking',
+            index=models.Index(fields=['status', '-created_at'], name='booking_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['status', '-created_at'], name='payment_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['payment_type', '-created_at'], name='payment_type_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['customer_email', '-created_at'], name='payment_email_created_idx'),
+        ),
+    ]
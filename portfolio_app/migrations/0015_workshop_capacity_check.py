@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_app', '0014_composite_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='workshop',
+            constraint=models.CheckConstraint(condition=models.Q(('registered_count__lte', models.F('max_participants'))), name='ck_workshop_capacity'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_app', '0015_workshop_capacity_check'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='payment',
+            name='portfolio_a_custome_215366_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='payment',
+            name='payment_email_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(django.db.models.functions.text.Lower('customer_email'), models.OrderBy(models.F('created_at'), descending=True), name='payment_email_lc_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workshopapplication',
+            index=models.Index(models.F('workshop'), django.db.models.functions.text.Lower('email'), name='application_wk_email_ci_idx'),
+        ),
+    ]
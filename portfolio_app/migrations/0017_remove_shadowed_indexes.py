@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_app', '0016_email_lower_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='payment',
+            name='portfolio_a_status_fcb838_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='payment',
+            name='portfolio_a_payment_cfd9ea_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='servicebooking',
+            name='portfolio_a_status_afa0ea_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='servicebooking',
+            name='portfolio_a_service_62c313_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='purchasedcourse',
+            name='portfolio_a_user_id_e19739_idx',
+        ),
+    ]
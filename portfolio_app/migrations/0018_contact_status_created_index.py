@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_app', '0017_remove_shadowed_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='contactmessage',
+            name='portfolio_a_status_cd00e8_idx',
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='contact_status_created_idx'),
+        ),
+    ]
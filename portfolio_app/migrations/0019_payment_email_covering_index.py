@@ -0,0 +1,24 @@
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_app', '0018_contact_status_created_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='payment',
+            name='payment_email_lc_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(django.db.models.functions.text.Lower('customer_email'), models.OrderBy(models.F('created_at'), descending=True), include=('payment_id', 'amount', 'status', 'payment_type'), name='payment_email_lc_cover_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchasedcourse',
+            index=models.Index(fields=['user', '-purchase_date'], name='purchase_user_date_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_app', '0019_payment_email_covering_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='workshop',
+            name='portfolio_a_is_paid_c5e0cd_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tradingservice',
+            name='portfolio_a_is_acti_0437e8_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tradingservice',
+            name='portfolio_a_is_feat_19bc10_idx',
+        ),
+        migrations.AddIndex(
+            model_name='workshop',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_paid', True)), fields=['start_date'], name='workshop_paid_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workshop',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_paid', False)), fields=['start_date'], name='workshop_free_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tradingservice',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['display_order'], name='service_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tradingservice',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_featured', True)), fields=['display_order'], name='service_featured_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tradingservice',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_popular', True)), fields=['display_order'], name='service_popular_order_idx'),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.functions import Lower
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.urls import reverse
@@ -116,8 +118,9 @@ class PurchasedCourse(models.Model):
     class Meta:
         ordering = ['-purchase_date']
         indexes = [
-            models.Index(fields=['user', 'status']),
             models.Index(fields=['-purchase_date']),
+            models.Index(fields=['user', 'status', '-purchase_date'], name='purchase_user_status_date_idx'),
+            models.Index(fields=['user', '-purchase_date'], name='purchase_user_date_idx'),
         ]
 
     def __str__(self):
@@ -251,8 +254,15 @@ class BlogPost(models.Model):
         ordering = ['-publish_date']
         indexes = [
             models.Index(fields=['-publish_date']),
-            models.Index(fields=['status']),
-            models.Index(fields=['is_featured']),
+            # Listings only read published posts; partial indexes keep drafts out of the B-tree
+            models.Index(
+                fields=['-publish_date'], name='blogpost_published_idx',
+                condition=models.Q(status='published'),
+            ),
+            models.Index(
+                fields=['-publish_date'], name='blogpost_featured_idx',
+                condition=models.Q(status='published', is_featured=True),
+            ),
         ]
 
     def __str__(self):
@@ -355,7 +365,23 @@ class Workshop(models.Model):
             models.Index(fields=['-start_date']),
             models.Index(fields=['status']),
             models.Index(fields=['is_featured']),
-            models.Index(fields=['is_paid']),
+            models.Index(fields=['is_active', '-start_date'], name='workshop_active_start_idx'),
+            models.Index(fields=['is_active', 'status', 'start_date'], name='workshop_active_status_idx'),
+            # Paid/free listings only show active workshops; partial indexes leave the rest out
+            models.Index(
+                fields=['start_date'], name='workshop_paid_start_idx',
+                condition=models.Q(is_active=True, is_paid=True),
+            ),
+            models.Index(
+                fields=['start_date'], name='workshop_free_start_idx',
+                condition=models.Q(is_active=True, is_paid=False),
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(registered_count__lte=F('max_participants')),
+                name='ck_workshop_capacity',
+            ),
         ]
 
     def __str__(self):
@@ -393,6 +419,15 @@ class Workshop(models.Model):
     def is_full(self):
         return self.registered_count >= self.max_participants
 
+    def try_register(self):
+        """Take one seat with a single guarded UPDATE; False when the workshop is full"""
+        taken = Workshop.objects.filter(
+            pk=self.pk, registered_count__lt=F('max_participants')
+        ).update(registered_count=F('registered_count') + 1)
+        if taken:
+            self.registered_count += 1
+        return bool(taken)
+
     @property
     def price_display(self):
         if self.is_paid and self.price:
@@ -470,6 +505,8 @@ class WorkshopApplication(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['payment_status']),
             models.Index(fields=['workshop', 'status']),
+            models.Index(fields=['workshop', '-applied_at'], name='application_workshop_date_idx'),
+            models.Index(F('workshop'), Lower('email'), name='application_wk_email_ci_idx'),
         ]
 
     def __str__(self):
@@ -486,11 +523,9 @@ class WorkshopApplication(models.Model):
         
         # Auto-approve free workshops or paid workshops with completed payment
         if (not self.workshop.is_paid or self.payment_status == 'completed') and self.status == 'pending':
-            if not self.workshop.is_full:
+            # Seat check and increment are one atomic UPDATE, so concurrent signups can't overbook
+            if self.workshop.try_register():
                 self.status = 'approved'
-                # Increment registered count
-                self.workshop.registered_count += 1
-                self.workshop.save(update_fields=['registered_count'])
             else:
                 self.status = 'waitlist'
         
@@ -502,10 +537,8 @@ class WorkshopApplication(models.Model):
         self.payment_id = payment_id
         self.payment_method = payment_method
         self.paid_at = timezone.now()
-        if self.status == 'pending' and not self.workshop.is_full:
+        if self.status == 'pending' and self.workshop.try_register():
             self.status = 'approved'
-            self.workshop.registered_count += 1
-            self.workshop.save(update_fields=['registered_count'])
         self.save()
 
 class TradingService(models.Model):
@@ -571,9 +604,20 @@ class TradingService(models.Model):
     class Meta:
         ordering = ['display_order', 'name']
         indexes = [
-            models.Index(fields=['is_active']),
-            models.Index(fields=['is_featured']),
             models.Index(fields=['display_order']),
+            # Listings only show active services; partial indexes leave inactive ones out
+            models.Index(
+                fields=['display_order'], name='service_active_order_idx',
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=['display_order'], name='service_featured_order_idx',
+                condition=models.Q(is_active=True, is_featured=True),
+            ),
+            models.Index(
+                fields=['display_order'], name='service_popular_order_idx',
+                condition=models.Q(is_active=True, is_popular=True),
+            ),
         ]
 
     def __str__(self):
@@ -654,8 +698,8 @@ class ServiceBooking(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['-created_at']),
-            models.Index(fields=['status']),
-            models.Index(fields=['service']),
+            models.Index(fields=['service', '-created_at'], name='booking_service_created_idx'),
+            models.Index(fields=['status', '-created_at'], name='booking_status_created_idx'),
         ]
 
     def __str__(self):
@@ -835,10 +879,15 @@ class Payment(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['-created_at']),
-            models.Index(fields=['status']),
-            models.Index(fields=['payment_type']),
-            models.Index(fields=['customer_email']),
             models.Index(fields=['razorpay_order_id']),
+            models.Index(fields=['status', '-created_at'], name='payment_status_created_idx'),
+            models.Index(fields=['payment_type', '-created_at'], name='payment_type_created_idx'),
+            # Emails are matched case-insensitively, so the index is on lower(customer_email)
+            # On PostgreSQL the INCLUDE columns let payment history be an index-only scan
+            models.Index(
+                Lower('customer_email'), F('created_at').desc(), name='payment_email_lc_cover_idx',
+                include=['payment_id', 'amount', 'status', 'payment_type'],
+            ),
         ]
 
     def __str__(self):
@@ -923,14 +972,25 @@ class ContactMessage(models.Model):
     # Additional metadata
     ip_address = models.GenericIPAddressField(null=True, blank=True, help_text="Sender's IP address")
     user_agent = models.TextField(blank=True, help_text="Sender's browser user agent")
+    
+    # Stored by the database so urgent-message filters run in SQL
+    is_urgent = models.GeneratedField(
+        expression=models.ExpressionWrapper(
+            models.Q(priority__in=['high', 'urgent']), output_field=models.BooleanField()
+        ),
+        output_field=models.BooleanField(),
+        db_persist=True,
+    )
 
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['-created_at']),
-            models.Index(fields=['status']),
             models.Index(fields=['priority']),
             models.Index(fields=['email']),
+            models.Index(fields=['is_urgent', '-created_at'], name='contact_urgent_created_idx'),
+            # Keyset pages of the inbox seek on (created_at, id), optionally within a status
+            models.Index(fields=['status', '-created_at', '-id'], name='contact_status_created_idx'),
         ]
 
     def __str__(self):
@@ -955,10 +1015,6 @@ class ContactMessage(models.Model):
     def is_new(self):
         return self.status == 'new'
 
-    @property
-    def is_urgent(self):
-        return self.priority in ['high', 'urgent']
-
     @property
     def response_time(self):
         """Calculate response time if replied"""
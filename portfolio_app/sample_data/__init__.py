@@ -0,0 +1,7 @@
+"""
+Sample data used by the seed_sample_data management command
+"""
+from .blog import create_sample_blog_data
+from .courses import create_sample_courses
+
+__all__ = ['create_sample_blog_data', 'create_sample_courses']
@@ -0,0 +1,71 @@
+"""
+Shared bulk insert pipeline for the sample data seeders
+"""
+import io
+
+from django.db import connection
+
+
+def bulk_create_missing(model, rows, build, key='title'):
+    """
+    Insert every row whose ``key`` is not yet in the table with one bulk_create.
+
+    Returns ``(created_objects, existing_keys)``. Created objects always carry
+    their primary key, even on backends that cannot return it from a bulk insert.
+    """
+    existing = set(
+        model.objects.filter(
+            **{f'{key}__in': [row[key] for row in rows]}
+        ).values_list(key, flat=True)
+    )
+    created = model.objects.bulk_create([build(row) for row in rows if row[key] not in existing])
+
+    if created and created[0].pk is None:
+        ids = dict(
+            model.objects.filter(
+                **{f'{key}__in': [getattr(obj, key) for obj in created]}
+            ).values_list(key, 'pk')
+        )
+        for obj in created:
+            obj.pk = ids[getattr(obj, key)]
+
+    return created, existing
+
+
+def bulk_create_links(through, source_field, target_field, pairs, batch_size=500):
+    """
+    Insert ``(source_id, target_id)`` pairs into a many-to-many through table.
+
+    PostgreSQL streams the rows with COPY, which is not bound by the bind
+    parameter limit of a multi-VALUES INSERT; other backends fall back to a
+    batched bulk_create.
+    """
+    if not pairs:
+        return
+
+    if connection.vendor != 'postgresql':
+        through.objects.bulk_create(
+            [through(**{f'{source_field}_id': source_id, f'{target_field}_id': target_id})
+             for source_id, target_id in pairs],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+        return
+
+    qn = connection.ops.quote_name
+    opts = through._meta
+    sql = 'COPY {} ({}, {}) FROM STDIN'.format(
+        qn(opts.db_table),
+        qn(opts.get_field(source_field).column),
+        qn(opts.get_field(target_field).column),
+    )
+    with connection.cursor() as cursor:
+        if hasattr(cursor, 'copy_expert'):
+            # psycopg2
+            data = io.StringIO(''.join(f'{source_id}\t{target_id}\n' for source_id, target_id in pairs))
+            cursor.copy_expert(sql, data)
+        else:
+            # psycopg 3
+            with cursor.copy(sql) as copy:
+                for row in pairs:
+                    copy.write_row(row)
@@ -0,0 +1,143 @@
+"""
+Sample blog categories, tags and posts
+"""
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.utils.text import slugify
+from portfolio_app.models import BlogCategory, BlogTag, BlogPost
+from .base import bulk_create_links, bulk_create_missing
+
+# Post bodies are only read for posts being inserted
+CONTENT_DIR = Path(__file__).resolve().parent / 'blog_content'
+
+CATEGORIES_DATA = [
+    {
+        'name': 'Market Analysis',
+        'description': 'In-depth analysis of market trends and movements'
+    },
+    {
+        'name': 'Trading Strategies',
+        'description': 'Proven trading strategies and techniques'
+    },
+    {
+        'name': 'Risk Management',
+        'description': 'Essential risk management principles for traders'
+    },
+    {
+        'name': 'Trading Psychology',
+        'description': 'Mental aspects of successful trading'
+    }
+]
+
+TAGS_DATA = [
+    'Intraday Trading', 'Technical Analysis', 'Fundamental Analysis',
+    'Options Trading', 'Swing Trading', 'Day Trading', 'Stock Market',
+    'Nifty 50', 'Bank Nifty', 'Risk Management', 'Trading Tips',
+    'Market Trends', 'Trading Psychology', 'Portfolio Management'
+]
+
+POSTS_DATA = [
+    {
+        'title': 'Understanding Nifty 50 Trends: A Complete Guide for Intraday Traders',
+        'excerpt': 'Learn how to analyze Nifty 50 trends and make profitable intraday trades with proper risk management techniques.',
+        'content_file': 'understanding-nifty-50-trends-a-complete-guide-for-intraday-traders.html',
+        'category': 'Market Analysis',
+        'tags': ['Intraday Trading', 'Nifty 50', 'Technical Analysis', 'Risk Management'],
+        'is_featured': True
+    },
+    {
+        'title': 'Top 5 Risk Management Strategies Every Trader Must Know',
+        'excerpt': 'Discover the essential risk management strategies that separate successful traders from the rest. Protect your capital and trade with confidence.',
+        'content_file': 'top-5-risk-management-strategies-every-trader-must-know.html',
+        'category': 'Risk Management',
+        'tags': ['Risk Management', 'Trading Tips', 'Portfolio Management'],
+        'is_featured': True
+    },
+    {
+        'title': 'Bank Nifty Options Trading: Advanced Strategies for Consistent Profits',
+        'excerpt': 'Master Bank Nifty options trading with these advanced strategies. Learn when to use straddles, strangles, and iron condors for maximum profitability.',
+        'content_file': 'bank-nifty-options-trading-advanced-strategies-for-consistent-profits.html',
+        'category': 'Trading Strategies',
+        'tags': ['Options Trading', 'Bank Nifty', 'Trading Strategies', 'Advanced Trading'],
+        'is_featured': False
+    },
+    {
+        'title': 'The Psychology of Trading: Overcoming Fear and Greed',
+        'excerpt': 'Discover how to master your emotions and develop the mental discipline required for successful trading. Learn to overcome fear, greed, and other psychological barriers.',
+        'content_file': 'the-psychology-of-trading-overcoming-fear-and-greed.html',
+        'category': 'Trading Psychology',
+        'tags': ['Trading Psychology', 'Mental Discipline', 'Trading Tips'],
+        'is_featured': False
+    }
+]
+
+def create_sample_blog_data():
+    # One COUNT per table decides whether anything is left to seed
+    if (
+        BlogPost.objects.filter(title__in=[p['title'] for p in POSTS_DATA]).count() == len(POSTS_DATA)
+        and BlogCategory.objects.filter(name__in=[c['name'] for c in CATEGORIES_DATA]).count() == len(CATEGORIES_DATA)
+    ):
+        print("Sample blog data already seeded")
+        return
+    
+    # Get or create admin user (only the PK is needed for the author FK)
+    admin_user_id = User.objects.filter(is_superuser=True).values_list('id', flat=True).first()
+    if admin_user_id is None:
+        admin_user_id = User.objects.create_superuser('admin', 'admin@example.com', '123').id
+    
+    # Create categories
+    categories = {}
+    for cat_data in CATEGORIES_DATA:
+        category, created = BlogCategory.objects.get_or_create(
+            name=cat_data['name'],
+            defaults={'description': cat_data['description']}
+        )
+        categories[cat_data['name']] = category
+        if created:
+            print(f"Created category: {category.name}")
+    
+    # Create tags
+    tags = {}
+    for tag_name in TAGS_DATA:
+        tag, created = BlogTag.objects.get_or_create(name=tag_name)
+        tags[tag_name] = tag
+        if created:
+            print(f"Created tag: {tag.name}")
+    
+    # Create blog posts; bulk_create bypasses BlogPost.save(), so derive slug/SEO fields here
+    created_posts, existing_titles = bulk_create_missing(
+        BlogPost,
+        POSTS_DATA,
+        lambda post_data: BlogPost(
+            title=post_data['title'],
+            slug=slugify(post_data['title']),
+            excerpt=post_data['excerpt'],
+            content=(CONTENT_DIR / post_data['content_file']).read_text(encoding='utf-8'),
+            author_id=admin_user_id,
+            category=categories[post_data['category']],
+            status='published',
+            is_featured=post_data['is_featured'],
+            meta_title=post_data['title'][:60],
+            meta_description=post_data['excerpt'][:160],
+        ),
+    )
+    new_posts_data = [p for p in POSTS_DATA if p['title'] not in existing_titles]
+    
+    # Add tags
+    bulk_create_links(BlogPost.tags.through, 'blogpost', 'blogtag', [
+        (post.pk, tag.pk)
+        for post, post_data in zip(created_posts, new_posts_data)
+        for tag_name in post_data['tags']
+        if (tag := tags.get(tag_name)) is not None
+    ])
+    
+    if existing_titles:
+        print(f"Posts already existing: {len(existing_titles)}")
+    if created_posts:
+        print(f"Created {len(created_posts)} blog posts: {', '.join(p.title for p in created_posts)}")
+    
+    print("\nBlog setup completed!")
+    print(f"Categories created: {len(categories)}")
+    print(f"Tags created: {len(tags)}")
+    print(f"Blog posts created: {len(created_posts)}")
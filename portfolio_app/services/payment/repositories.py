@@ -3,6 +3,7 @@ Repository implementations for payment data access following SOLID principles
 """
 import uuid
 from typing import Dict, Any, Optional
+from django.db.models.functions import Lower
 from django.utils import timezone
 
 from .interfaces import IPaymentRepository, IItemRepository, PaymentRequest, PaymentType, PaymentStatus
@@ -136,7 +137,7 @@ class ItemRepository(IItemRepository):
     
     def check_duplicate_application(self, workshop_id: str, email: str) -> bool:
         """Check if user already applied for workshop"""
-        return WorkshopApplication.objects.filter(
+        return WorkshopApplication.objects.alias(email_lower=Lower('email')).filter(
             workshop_id=workshop_id,
-            email=email
+            email_lower=email.lower()
         ).exists()
\ No newline at end of file
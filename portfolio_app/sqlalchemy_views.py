@@ -93,9 +93,9 @@ class BlogPostListSQLAlchemyView(generics.ListAPIView):
         try:
             with ContentService() as content_service:
                 # Get published posts using SQLAlchemy
-                posts = content_service.get_published_posts(limit=20)
+                posts = content_service.list_published_posts_summary(limit=20)
                 
-                # Convert SQLAlchemy objects to Django model instances for serializer
+                # Convert SQLAlchemy rows to Django model instances for serializer
                 post_ids = [p.id for p in posts]
                 return BlogPost.objects.filter(id__in=post_ids).select_related('author', 'category').prefetch_related('tags')
         except Exception as e:
@@ -116,10 +116,10 @@ class TradingServiceListSQLAlchemyView(generics.ListAPIView):
         try:
             with ProductService() as product_service:
                 # Get active services using SQLAlchemy
-                services = product_service.get_active_services(limit=20)
+                services = product_service.get_active_services_summary(limit=20)
                 
-                # Convert SQLAlchemy objects to Django model instances for serializer
-                service_ids = [s.id for s in services]
+                # Convert SQLAlchemy rows to Django model instances for serializer
+                service_ids = [s['id'] for s in services]
                 return TradingService.objects.filter(id__in=service_ids)
         except Exception as e:
             logger.error(f"Error getting trading services from SQLAlchemy: {e}")
@@ -215,12 +215,12 @@ def sqlalchemy_demo_data(request):
         
         # Get blog posts using SQLAlchemy
         with ContentService() as content_service:
-            posts = content_service.get_published_posts(limit=5)
+            posts = content_service.list_published_posts_summary(limit=5)
             demo_data['blog_posts'] = [
                 {
                     'id': p.id,
                     'title': p.title,
-                    'views_count': p.total_views,
+                    'views_count': p.views_count,
                     'publish_date': p.publish_date.isoformat()
                 }
                 for p in posts
@@ -228,14 +228,14 @@ def sqlalchemy_demo_data(request):
         
         # Get trading services using SQLAlchemy
         with ProductService() as product_service:
-            services = product_service.get_active_services(limit=5)
+            services = product_service.get_active_services_summary(limit=5)
             demo_data['trading_services'] = [
                 {
-                    'id': s.id,
-                    'name': s.name,
-                    'service_type': s.service_type,
-                    'price': float(s.price),
-                    'is_featured': s.is_featured
+                    'id': s['id'],
+                    'name': s['name'],
+                    'service_type': s['service_type'],
+                    'price': float(s['price']),
+                    'is_featured': s['is_featured']
                 }
                 for s in services
             ]
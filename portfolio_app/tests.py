@@ -1,3 +1,187 @@
-from django.test import TestCase
+from datetime import datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database.config import Base
+from database.models.contact_models import ContactMessage
+from database.models.payment_models import Payment
+from database.models.user_models import User, UserProfile
+from database.models.workshop_models import Workshop, WorkshopApplication
+from database.services import PaymentService, WorkshopService, base_service
+from database.services.base_service import LIST_CACHE_TTL
+from database.services.payment_service import ContactMessageWriter
+
+
+class WorkshopSessionMixin:
+    """An in-memory SQLite session holding one featured workshop with one application"""
+
+    def setUp(self):
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine, tables=[
+            User.__table__, UserProfile.__table__, Workshop.__table__, WorkshopApplication.__table__,
+        ])
+        self.session = Session(engine)
+        self.addCleanup(self.session.close)
+
+        instructor = User(username='instructor', email='instructor@example.com', password_hash='x')
+        workshop = Workshop(
+            title='Options Basics', slug='options-basics', description='Intro', short_description='Intro',
+            featured_image='workshops/options.jpg', start_date=datetime.now() + timedelta(days=7),
+            end_date=datetime.now() + timedelta(days=8), duration_hours=4, instructor=instructor,
+            is_featured=True,
+        )
+        self.session.add(WorkshopApplication(workshop=workshop, name='Asha', email='asha@example.com'))
+        self.session.commit()
+        self.workshop_id = workshop.id
+        # Start each list query from an empty identity map
+        self.session.expunge_all()
+
+
+class ServiceSessionTests(WorkshopSessionMixin, SimpleTestCase):
+    """Services share a session they don't own"""
+
+    def test_leaving_a_service_keeps_the_session_open(self):
+        with WorkshopService(session=self.session) as service:
+            workshop = service.get(self.workshop_id)
+        self.assertIn(workshop, self.session)
+
+
+class CachedListTests(WorkshopSessionMixin, SimpleTestCase):
+    """Lists served through BaseService._cached_list"""
+
+    def test_cache_miss_queries_the_injected_session_bind(self):
+        workshops = WorkshopService(session=self.session).get_featured_workshops()
+        self.assertEqual([workshop.id for workshop in workshops], [self.workshop_id])
+        self.assertIn(workshops[0], self.session)
+
+    def test_seat_change_invalidates_only_after_commit(self):
+        service = WorkshopService(session=self.session)
+        self.assertEqual(service.get_featured_workshops()[0].registered_count, 0)
+        self.assertTrue(service.try_register(self.workshop_id))
+        # Not committed yet: the cached list is still the committed state
+        cache_key = (Workshop, self.session.get_bind(), ('featured', 5))
+        self.assertIn(cache_key, base_service._list_cache(LIST_CACHE_TTL))
+        self.session.commit()
+        self.assertEqual(service.get_featured_workshops()[0].registered_count, 1)
+
+
+class StrictLoadingTests(WorkshopSessionMixin, SimpleTestCase):
+    """SQLAlchemy list queries with SQLALCHEMY_STRICT_LOADING turned on"""
+
+    def setUp(self):
+        super().setUp()
+
+        patcher = mock.patch('database.services.base_service.STRICT_LOADING', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = WorkshopService(session=self.session)
+
+    def test_mapped_eager_loads_still_run(self):
+        applications = self.service.get_workshop_applications(self.workshop_id)
+        # WorkshopApplication.workshop is mapped lazy='selectin'
+        self.assertEqual(applications[0].workshop.slug, 'options-basics')
+
+    def test_unplanned_lazy_load_raises(self):
+        workshops = self.service.get_active_workshops()
+        self.assertEqual(len(workshops), 1)
+        with self.assertRaises(InvalidRequestError):
+            workshops[0].applications
+
+
+class ContactMessageWriterTests(SimpleTestCase):
+    """Batched background writes of contact messages"""
+
+    def setUp(self):
+        # One shared connection, so the writer's thread sees the same in-memory database
+        self.engine = create_engine(
+            'sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False}
+        )
+        Base.metadata.create_all(self.engine, tables=[User.__table__, ContactMessage.__table__])
+        self.inserts = []
+        event.listen(self.engine, 'before_cursor_execute', self._record_insert)
+
+    def _record_insert(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT'):
+            self.inserts.append(statement)
+
+    def _writer(self, **options):
+        options.setdefault('interval', 0.01)
+        writer = ContactMessageWriter(session_factory=sessionmaker(bind=self.engine), **options)
+        self.addCleanup(writer.shutdown)
+        return writer
+
+    def _row(self, n, **fields):
+        return {'name': f'Visitor {n}', 'email': f'visitor{n}@example.com',
+                'subject': 'Mentorship', 'message': 'Hello', **fields}
+
+    def _stored_names(self):
+        with Session(self.engine) as session:
+            return sorted(session.scalars(select(ContactMessage.name)))
+
+    def test_batch_is_written_in_one_insert(self):
+        writer = self._writer(batch_size=5, interval=5)
+        for n in range(5):
+            writer.put(self._row(n))
+        writer.shutdown()
+        self.assertEqual(len(self._stored_names()), 5)
+        self.assertEqual(len(self.inserts), 1)
+
+    def test_failed_batch_falls_back_to_rows(self):
+        writer = self._writer(batch_size=3, retries=1)
+        # subject is NOT NULL, so only this row is rejected
+        rows = [self._row(0), self._row(1, subject=None), self._row(2)]
+        with self.assertLogs('database.services.payment_service', 'ERROR') as logs:
+            for row in rows:
+                writer.put(row)
+            writer.shutdown()
+        self.assertEqual(self._stored_names(), ['Visitor 0', 'Visitor 2'])
+        self.assertIn('visitor1@example.com', logs.output[0])
+
+    def test_shutdown_writes_the_batch_in_flight(self):
+        # The worker is still waiting for its batch to fill when shutdown() arrives
+        writer = self._writer(batch_size=50, interval=30)
+        writer.put(self._row(0))
+        writer.put(self._row(1))
+        writer.shutdown()
+        self.assertFalse(writer._thread.is_alive())
+        self.assertEqual(self._stored_names(), ['Visitor 0', 'Visitor 1'])
+
+    def test_put_after_shutdown_writes_immediately(self):
+        writer = self._writer()
+        writer.shutdown()
+        writer.put(self._row(0))
+        self.assertEqual(self._stored_names(), ['Visitor 0'])
+
+    def test_unknown_field_is_rejected(self):
+        writer = self._writer()
+        with self.assertRaises(TypeError):
+            writer.put(self._row(0, nonexistent_col=1))
+
+
+class PaymentFailureTests(SimpleTestCase):
+    """PaymentService.mark_payment_failed"""
+
+    def setUp(self):
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(engine, tables=[Payment.__table__])
+        self.session = Session(engine)
+        self.addCleanup(self.session.close)
+        self.service = PaymentService(session=self.session)
+
+    def test_reason_is_merged_into_gateway_response(self):
+        self.service.create_payment(
+            'pay_1', 499, 'workshop', customer_name='Asha', customer_email='asha@example.com',
+            gateway_response={'code': 'BAD_REQUEST_ERROR'}
+        )
+        self.assertTrue(self.service.mark_payment_failed('pay_1', 'card declined'))
+        self.session.expire_all()
+        payment = self.service.get_payment_by_id('pay_1')
+        self.assertEqual(payment.status, 'failed')
+        self.assertEqual(
+            payment.gateway_response, {'code': 'BAD_REQUEST_ERROR', 'failure_reason': 'card declined'}
+        )
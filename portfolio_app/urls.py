@@ -57,6 +57,7 @@ from .sqlalchemy_views import (
     user_dashboard_sqlalchemy,
     sqlalchemy_demo_data,
 )
+from .metrics_views import prometheus_metrics
 
 # App namespace for URL reversing
 app_name = 'portfolio_app'
@@ -157,4 +158,5 @@ urlpatterns = [
     path('tidb/services/', TradingServiceListSQLAlchemyView.as_view(), name='services-sqlalchemy'),
     path('tidb/dashboard/', user_dashboard_sqlalchemy, name='dashboard-sqlalchemy'),
     path('tidb/demo/', sqlalchemy_demo_data, name='sqlalchemy-demo'),
+    path('tidb/metrics/', prometheus_metrics, name='tidb-metrics'),
 ]
\ No newline at end of file
@@ -108,6 +108,15 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Argon2 (native libargon2) for new hashes; existing PBKDF2 hashes still verify
+# and are upgraded to Argon2 on the user's next login
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
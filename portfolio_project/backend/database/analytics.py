@@ -2,149 +2,298 @@
 Analytics Services for Business Intelligence and Reporting
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, or_
-from database.config import SessionLocal
+from sqlalchemy import (
+    func, desc, and_, or_, select, true, bindparam, cast, type_coerce, Integer, Float, String
+)
+from database.config import ScopedSession
+from database.core_query import rows_to_dicts
 from database.models import (
     UserAnalytics, WorkshopAnalytics, ContentAnalytics, 
-    RevenueAnalytics, NewsletterAnalytics, TradingServiceAnalytics,
+    RevenueAnalytics, RevenueWeeklyRollup, NewsletterAnalytics, TradingServiceAnalytics,
     UserBehaviorLog, MarketingCampaignAnalytics
 )
+from django.core.cache import cache
 from datetime import datetime, timedelta
+from functools import wraps
 from typing import Dict, List, Optional
+import inspect
 import logging
+import os
+import time
 
 logger = logging.getLogger(__name__)
 
+class RateLimitingFilter(logging.Filter):
+    """Let each distinct message through at most once per interval"""
+    
+    def __init__(self, interval: float = 60.0):
+        super().__init__()
+        self.interval = interval
+        self._last_emitted = {}
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        now = time.monotonic()
+        key = (record.name, record.msg)
+        if now - self._last_emitted.get(key, float('-inf')) < self.interval:
+            return False
+        self._last_emitted[key] = now
+        return True
+
+# A failing TiDB link makes every dashboard poll log the same error; keep bursts to one line a minute
+logger.addFilter(RateLimitingFilter(float(os.getenv('ANALYTICS_LOG_INTERVAL', '60'))))
+
+ANALYTICS_CACHE_TTL = int(os.getenv('ANALYTICS_CACHE_TTL', '600'))
+ANALYTICS_CACHE_GENERATION_KEY = 'analytics:generation'
+# Opt out of TiFlash columnar reads (e.g. clusters without TiFlash nodes)
+DISABLE_COLUMNAR = os.getenv('DISABLE_COLUMNAR', 'false').lower() == 'true'
+
+def _cache_generation() -> int:
+    """Current analytics cache generation; bumping it invalidates every cached result"""
+    return cache.get_or_set(ANALYTICS_CACHE_GENERATION_KEY, 0, None)
+
+def invalidate_analytics_cache():
+    """Drop all cached analytics results (call after analytics rows are written)"""
+    try:
+        cache.incr(ANALYTICS_CACHE_GENERATION_KEY)
+    except ValueError:
+        cache.set(ANALYTICS_CACHE_GENERATION_KEY, 1, None)
+
+def cached_analytics(name: str):
+    """Memoize an AnalyticsService method in the Django cache, keyed by its arguments"""
+    def decorator(method):
+        signature = inspect.signature(method)
+        
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = ':'.join(str(value) for key, value in bound.arguments.items() if key != 'self')
+            key = f"analytics:{name}:{_cache_generation()}:{params}"
+            
+            result = cache.get(key)
+            if result is None:
+                result = method(self, *args, **kwargs)
+                # Error paths return empty results; don't pin those for the TTL
+                if result:
+                    cache.set(key, result, ANALYTICS_CACHE_TTL)
+            return result
+        return wrapper
+    return decorator
+
+def _int_total(expr):
+    """Aggregate as a non-null integer, resolved in SQL"""
+    return cast(func.coalesce(expr, 0), Integer)
+
+def _float_total(expr):
+    """Aggregate as a non-null float (DECIMAL results are converted by the Float type)"""
+    return type_coerce(func.coalesce(expr, 0), Float)
+
+def _read_from_tiflash(stmt, model):
+    """Hint TiDB to scan the model's TiFlash (columnar) replica for this query block"""
+    if DISABLE_COLUMNAR:
+        return stmt
+    return stmt.prefix_with(
+        f"/*+ READ_FROM_STORAGE(TIFLASH[{model.__tablename__}]) */", dialect='mysql'
+    )
+
+def _as_float(column):
+    """Project a NUMERIC column as a float (converted by the Float result processor)"""
+    return type_coerce(column, Float).label(column.key)
+
+def _cents_as_amount(column):
+    """Project an integer-cents column as a float currency amount, dropping the _cents suffix"""
+    return type_coerce(column / 100, Float).label(column.key.removesuffix('_cents'))
+
+def _as_iso_date(column):
+    """Project a DATE column as its 'YYYY-MM-DD' string"""
+    return cast(column, String).label(column.key)
+
+# Hot statements are built once at import; per-request values travel as bind
+# parameters so each call skips statement construction and reuses the compiled SQL
+def _dashboard_metrics_statement():
+    """All four dashboard aggregates in a single round trip (one derived table each)"""
+    revenue = _read_from_tiflash(select(
+        _float_total(func.sum(RevenueAnalytics.total_revenue_cents) / 100).label('total_revenue'),
+        _float_total(func.avg(RevenueAnalytics.total_revenue_cents) / 100).label('avg_daily_revenue'),
+        _int_total(func.sum(RevenueAnalytics.total_transactions)).label('total_transactions')
+    ).where(
+        RevenueAnalytics.date >= bindparam('start_date'),
+        RevenueAnalytics.date < bindparam('end_date')
+    ), RevenueAnalytics).subquery('revenue')
+    
+    users = _read_from_tiflash(select(
+        func.count(UserAnalytics.id).label('total_users'),
+        _int_total(func.sum(UserAnalytics.workshops_attended)).label('total_workshop_attendees'),
+        _int_total(func.sum(UserAnalytics.courses_purchased)).label('total_course_purchases')
+    ), UserAnalytics).subquery('users')
+    
+    workshops = _read_from_tiflash(select(
+        func.count(WorkshopAnalytics.id).label('total_workshops'),
+        _int_total(func.sum(WorkshopAnalytics.total_registrations)).label('total_registrations'),
+        _float_total(func.avg(
+            WorkshopAnalytics.confirmed_attendees * 100.0
+            / func.nullif(WorkshopAnalytics.total_registrations, 0)
+        )).label('avg_completion_rate')
+    ).where(
+        WorkshopAnalytics.workshop_date >= bindparam('workshops_since')
+    ), WorkshopAnalytics).subquery('workshops')
+    
+    content = _read_from_tiflash(select(
+        _int_total(func.sum(ContentAnalytics.total_views)).label('total_content_views'),
+        _int_total(func.avg(ContentAnalytics.average_time_on_page)).label('avg_time_on_page'),
+        func.count(ContentAnalytics.id).label('total_content_pieces')
+    ), ContentAnalytics).subquery('content')
+    
+    return select(revenue, users, workshops, content).select_from(
+        revenue.join(users, true()).join(workshops, true()).join(content, true())
+    )
+
+DASHBOARD_METRICS = _dashboard_metrics_statement()
+
+# Columns arrive already serializable, so rows map straight to dicts
+REVENUE_TRENDS = select(
+    _as_iso_date(RevenueAnalytics.date),
+    _cents_as_amount(RevenueAnalytics.total_revenue_cents),
+    _cents_as_amount(RevenueAnalytics.workshop_revenue_cents),
+    _cents_as_amount(RevenueAnalytics.product_revenue_cents),
+    _cents_as_amount(RevenueAnalytics.service_revenue_cents)
+).where(
+    # Half-open range on the bare column keeps the date index usable
+    RevenueAnalytics.date >= bindparam('start_date'),
+    RevenueAnalytics.date < bindparam('end_date')
+).order_by(RevenueAnalytics.date).execution_options(
+    # Server-side cursor: rows are fetched in batches while the list is built,
+    # instead of materializing every row before converting it
+    stream_results=True, yield_per=1000
+)
+
+# One row per week, so a quarter is ~13 rows instead of ~90 daily rows
+WEEKLY_REVENUE_TRENDS = select(
+    _as_iso_date(RevenueWeeklyRollup.week_start),
+    _cents_as_amount(RevenueWeeklyRollup.total_revenue_cents),
+    _cents_as_amount(RevenueWeeklyRollup.workshop_revenue_cents),
+    _cents_as_amount(RevenueWeeklyRollup.product_revenue_cents),
+    _cents_as_amount(RevenueWeeklyRollup.service_revenue_cents),
+    RevenueWeeklyRollup.total_transactions.label('transactions')
+).where(
+    RevenueWeeklyRollup.week_start >= bindparam('start_date')
+).order_by(RevenueWeeklyRollup.week_start)
+
+# Project only the columns returned; no ORM entities are built
+TOP_CONTENT = select(
+    ContentAnalytics.title,
+    ContentAnalytics.category,
+    ContentAnalytics.total_views,
+    ContentAnalytics.unique_visitors.label('unique_views'),
+    ContentAnalytics.average_time_on_page.label('avg_time_on_page'),
+    ContentAnalytics.social_shares,
+    _as_float(ContentAnalytics.trending_score)
+).order_by(
+    desc(ContentAnalytics.total_views)
+).limit(bindparam('limit', type_=Integer))
+
 class AnalyticsService:
     """Main analytics service for business intelligence"""
     
-    def __init__(self):
-        self.db = SessionLocal()
+    def __init__(self, session: Optional[Session] = None):
+        # Neither session is this service's to close: SQLAlchemyMiddleware removes the
+        # request's registry, and an injected session belongs to the caller
+        self.db = session if session is not None else ScopedSession
     
     def __enter__(self):
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.db.close()
+        pass
     
+    @cached_analytics('dashboard')
     def get_dashboard_metrics(self, days: int = 30) -> Dict:
         """Get key metrics for dashboard"""
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
         try:
-            # Revenue metrics
-            revenue_data = self.db.query(
-                func.sum(RevenueAnalytics.total_revenue).label('total_revenue'),
-                func.avg(RevenueAnalytics.total_revenue).label('avg_daily_revenue'),
-                func.sum(RevenueAnalytics.total_transactions).label('total_transactions')
-            ).filter(
-                RevenueAnalytics.date >= start_date.date()
-            ).first()
-            
-            # User metrics
-            user_metrics = self.db.query(
-                func.count(UserAnalytics.id).label('total_users'),
-                func.sum(UserAnalytics.workshops_attended).label('total_workshop_attendees'),
-                func.sum(UserAnalytics.courses_purchased).label('total_course_purchases')
-            ).first()
-            
-            # Workshop metrics
-            workshop_metrics = self.db.query(
-                func.count(WorkshopAnalytics.id).label('total_workshops'),
-                func.sum(WorkshopAnalytics.total_registrations).label('total_registrations'),
-                func.avg(WorkshopAnalytics.completion_rate).label('avg_completion_rate')
-            ).filter(
-                WorkshopAnalytics.workshop_date >= start_date
-            ).first()
-            
-            # Content metrics
-            content_metrics = self.db.query(
-                func.sum(ContentAnalytics.total_views).label('total_content_views'),
-                func.avg(ContentAnalytics.avg_time_on_page).label('avg_time_on_page'),
-                func.count(ContentAnalytics.id).label('total_content_pieces')
-            ).first()
+            (
+                total_revenue, avg_daily_revenue, total_transactions,
+                total_users, total_workshop_attendees, total_course_purchases,
+                total_workshops, total_registrations, avg_completion_rate,
+                total_content_views, avg_time_on_page, total_content_pieces
+            ) = self.db.execute(DASHBOARD_METRICS, {
+                'start_date': start_date.date(),
+                'end_date': end_date.date() + timedelta(days=1),
+                'workshops_since': start_date
+            }).one()
             
+            # Values arrive non-null and typed (COALESCE/CAST in SQL); no per-column casts here
             return {
                 'revenue': {
-                    'total': float(revenue_data.total_revenue or 0),
-                    'daily_average': float(revenue_data.avg_daily_revenue or 0),
-                    'transactions': int(revenue_data.total_transactions or 0)
+                    'total': total_revenue,
+                    'daily_average': avg_daily_revenue,
+                    'transactions': total_transactions
                 },
                 'users': {
-                    'total': int(user_metrics.total_users or 0),
-                    'workshop_attendees': int(user_metrics.total_workshop_attendees or 0),
-                    'course_purchases': int(user_metrics.total_course_purchases or 0)
+                    'total': total_users,
+                    'workshop_attendees': total_workshop_attendees,
+                    'course_purchases': total_course_purchases
                 },
                 'workshops': {
-                    'total': int(workshop_metrics.total_workshops or 0),
-                    'registrations': int(workshop_metrics.total_registrations or 0),
-                    'completion_rate': float(workshop_metrics.avg_completion_rate or 0)
+                    'total': total_workshops,
+                    'registrations': total_registrations,
+                    'completion_rate': avg_completion_rate
                 },
                 'content': {
-                    'total_views': int(content_metrics.total_content_views or 0),
-                    'avg_time_on_page': int(content_metrics.avg_time_on_page or 0),
-                    'total_pieces': int(content_metrics.total_content_pieces or 0)
+                    'total_views': total_content_views,
+                    'avg_time_on_page': avg_time_on_page,
+                    'total_pieces': total_content_pieces
                 }
             }
             
         except Exception as e:
-            logger.error(f"Error getting dashboard metrics: {e}")
+            logger.error("Error getting dashboard metrics: %s", e)
             return {}
     
+    @cached_analytics('revenue_trends')
     def get_revenue_trends(self, days: int = 90) -> List[Dict]:
         """Get revenue trends over time"""
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
         try:
-            revenue_trends = self.db.query(
-                RevenueAnalytics.date,
-                RevenueAnalytics.total_revenue,
-                RevenueAnalytics.workshop_revenue,
-                RevenueAnalytics.product_revenue,
-                RevenueAnalytics.service_revenue
-            ).filter(
-                RevenueAnalytics.date >= start_date.date()
-            ).order_by(RevenueAnalytics.date).all()
+            revenue_trends = self.db.execute(REVENUE_TRENDS, {
+                'start_date': start_date.date(),
+                'end_date': end_date.date() + timedelta(days=1)
+            })
             
-            return [
-                {
-                    'date': trend.date.isoformat(),
-                    'total_revenue': float(trend.total_revenue),
-                    'workshop_revenue': float(trend.workshop_revenue),
-                    'product_revenue': float(trend.product_revenue),
-                    'service_revenue': float(trend.service_revenue)
-                }
-                for trend in revenue_trends
-            ]
+            return rows_to_dicts(revenue_trends)
             
         except Exception as e:
-            logger.error(f"Error getting revenue trends: {e}")
+            logger.error("Error getting revenue trends: %s", e)
             return []
     
+    @cached_analytics('weekly_revenue_trends')
+    def get_weekly_revenue_trends(self, weeks: int = 12) -> List[Dict]:
+        """Get weekly revenue totals from the pre-aggregated rollup"""
+        start_date = datetime.now().date() - timedelta(weeks=weeks)
+        
+        try:
+            weekly_trends = self.db.execute(WEEKLY_REVENUE_TRENDS, {'start_date': start_date})
+            
+            return rows_to_dicts(weekly_trends)
+            
+        except Exception as e:
+            logger.error("Error getting weekly revenue trends: %s", e)
+            return []
+    
+    @cached_analytics('top_content')
     def get_top_performing_content(self, limit: int = 10) -> List[Dict]:
         """Get top performing content by views"""
         try:
-            top_content = self.db.query(ContentAnalytics).order_by(
-                desc(ContentAnalytics.total_views)
-            ).limit(limit).all()
+            top_content = self.db.execute(TOP_CONTENT, {'limit': limit})
             
-            return [
-                {
-                    'title': content.title,
-                    'category': content.category,
-                    'total_views': content.total_views,
-                    'unique_views': content.unique_views,
-                    'avg_time_on_page': content.avg_time_on_page,
-                    'social_shares': content.social_shares,
-                    'trending_score': float(content.trending_score)
-                }
-                for content in top_content
-            ]
+            return rows_to_dicts(top_content)
             
         except Exception as e:
-            logger.error(f"Error getting top content: {e}")
+            logger.error("Error getting top content: %s", e)
             return []
 
 # Convenience functions
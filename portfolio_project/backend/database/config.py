@@ -2,61 +2,88 @@
 SQLAlchemy Database Configuration for TiDB Cloud
 """
 import os
+from dataclasses import dataclass, field
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Database Configuration
+def _env_flag(name: str, default: str = 'false') -> bool:
+    return os.getenv(name, default).lower() == 'true'
+
+# Database Configuration (read from the environment once, at import)
+@dataclass(frozen=True, slots=True)
 class DatabaseConfig:
-    def __init__(self):
-        # TiDB Cloud connection parameters
-        self.host = os.getenv('TIDB_HOST', 'localhost')
-        self.port = os.getenv('TIDB_PORT', '4000')
-        self.user = os.getenv('TIDB_USER', 'root')
-        self.password = os.getenv('TIDB_PASSWORD', '')
-        self.database = os.getenv('TIDB_DATABASE', 'portfolio_db')
-        
-        # SSL Configuration for TiDB Cloud
-        self.ssl_ca = os.getenv('TIDB_SSL_CA', '')
-        self.ssl_disabled = os.getenv('TIDB_SSL_DISABLED', 'false').lower() == 'true'
-        
-        # Connection pool settings
-        self.pool_size = int(os.getenv('DB_POOL_SIZE', '10'))
-        self.max_overflow = int(os.getenv('DB_MAX_OVERFLOW', '20'))
-        self.pool_timeout = int(os.getenv('DB_POOL_TIMEOUT', '30'))
-        self.pool_recycle = int(os.getenv('DB_POOL_RECYCLE', '3600'))
+    # TiDB Cloud connection parameters
+    host: str = field(default_factory=lambda: os.getenv('TIDB_HOST', 'localhost'))
+    port: str = field(default_factory=lambda: os.getenv('TIDB_PORT', '4000'))
+    user: str = field(default_factory=lambda: os.getenv('TIDB_USER', 'root'))
+    password: str = field(default_factory=lambda: os.getenv('TIDB_PASSWORD', ''))
+    database: str = field(default_factory=lambda: os.getenv('TIDB_DATABASE', 'portfolio_db'))
+    
+    # SSL Configuration for TiDB Cloud
+    ssl_ca: str = field(default_factory=lambda: os.getenv('TIDB_SSL_CA', ''))
+    ssl_disabled: bool = field(default_factory=lambda: _env_flag('TIDB_SSL_DISABLED'))
+    
+    # Connection pool settings
+    pool_size: int = field(default_factory=lambda: int(os.getenv('DB_POOL_SIZE', '10')))
+    max_overflow: int = field(default_factory=lambda: int(os.getenv('DB_MAX_OVERFLOW', '20')))
+    pool_timeout: int = field(default_factory=lambda: int(os.getenv('DB_POOL_TIMEOUT', '30')))
+    # Recycle below TiDB Cloud's idle-connection timeout so pooled connections are
+    # replaced before the server drops them; this stands in for a per-checkout ping
+    pool_recycle: int = field(default_factory=lambda: int(os.getenv('DB_POOL_RECYCLE', '1800')))
+    pool_pre_ping: bool = field(default_factory=lambda: _env_flag('DB_POOL_PRE_PING'))
+    # LIFO checkout reuses the most recent connections, so surplus ones sit idle and
+    # age out through pool_recycle instead of each going stale in a FIFO rotation
+    pool_use_lifo: bool = field(default_factory=lambda: _env_flag('DB_POOL_USE_LIFO', 'true'))
+    # Compiled-SQL cache entries per engine (SQLAlchemy's default is 500)
+    query_cache_size: int = field(default_factory=lambda: int(os.getenv('DB_QUERY_CACHE_SIZE', '1200')))
+    # Rows per multi-VALUES statement when an INSERT is executed with many parameter sets
+    insertmanyvalues_page_size: int = field(default_factory=lambda: int(os.getenv('DB_INSERT_PAGE_SIZE', '1000')))
+    echo: bool = field(default_factory=lambda: _env_flag('DB_ECHO'))  # Set to True for SQL logging
         
     def get_database_url(self):
-        """Generate database URL for SQLAlchemy"""
+        """Generate database URL for SQLAlchemy (mysqlclient C driver)"""
+        base_url = f"mysql+mysqldb://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
         if self.ssl_disabled:
             # For local development or when SSL is disabled
-            return f"mysql+pymysql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
-        else:
-            # For TiDB Cloud with SSL - use ssl=true for TiDB Cloud
-            ssl_args = "?ssl=true&ssl_verify_cert=false&ssl_verify_identity=false"
-            
-            return f"mysql+pymysql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}{ssl_args}"
+            return base_url
+        if self.ssl_ca:
+            # Verify TiDB Cloud's certificate when a CA bundle is configured
+            return f"{base_url}?ssl_ca={self.ssl_ca}&ssl_mode=VERIFY_IDENTITY"
+        # TLS without certificate verification (previous ssl_verify_cert=false behaviour)
+        return f"{base_url}?ssl_mode=REQUIRED"
 
 # Initialize database configuration
 db_config = DatabaseConfig()
+DATABASE_URL = db_config.get_database_url()
 
 # Create SQLAlchemy engine
 engine = create_engine(
-    db_config.get_database_url(),
+    DATABASE_URL,
     pool_size=db_config.pool_size,
     max_overflow=db_config.max_overflow,
     pool_timeout=db_config.pool_timeout,
     pool_recycle=db_config.pool_recycle,
-    echo=os.getenv('DB_ECHO', 'false').lower() == 'true',  # Set to True for SQL logging
-    pool_pre_ping=True,  # Verify connections before use
+    echo=db_config.echo,
+    # A pre-ping costs a TLS round trip on every checkout; a connection that still goes
+    # stale raises a disconnect error, which invalidates the pool so the next checkout reconnects
+    pool_pre_ping=db_config.pool_pre_ping,
+    pool_use_lifo=db_config.pool_use_lifo,
+    query_cache_size=db_config.query_cache_size,
+    insertmanyvalues_page_size=db_config.insertmanyvalues_page_size,
 )
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Services commit and then return the objects they wrote; keeping them loaded after
+# commit avoids a SELECT per object the moment the caller reads an attribute
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Request-scoped session registry; SQLAlchemyMiddleware removes it when the request ends
+ScopedSession = scoped_session(SessionLocal)
 
 # Create Base class for models
 Base = declarative_base()
@@ -0,0 +1,15 @@
+"""
+Helpers for serializing SQLAlchemy Core results without building ORM instances
+"""
+from typing import Dict, Iterator, List
+from sqlalchemy.engine import Result
+
+def iter_dicts(result: Result) -> Iterator[Dict]:
+    """Yield each row of a Core result as a plain dict keyed by column label"""
+    keys = tuple(result.keys())
+    for row in result:
+        yield dict(zip(keys, row))
+
+def rows_to_dicts(result: Result) -> List[Dict]:
+    """Materialize a Core result as a list of dicts keyed by column label"""
+    return list(iter_dicts(result))
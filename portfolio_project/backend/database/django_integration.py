@@ -3,56 +3,65 @@ Django Integration Layer for SQLAlchemy
 This module provides utilities to integrate SQLAlchemy with Django
 """
 from django.conf import settings
-from database.config import test_connection, init_db
+from database.config import ScopedSession, test_connection, init_db
 from database.services import UserService, ContentService, WorkshopService, ProductService, PaymentService
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+_service_lock = threading.Lock()
+
+def _singleton(factory):
+    """Build ``factory()`` once per process, even under threaded workers"""
+    instance = None
+    
+    def get():
+        nonlocal instance
+        if instance is None:
+            with _service_lock:
+                if instance is None:
+                    # Shared by every worker thread, so it must hold the thread-local
+                    # registry, never a plain Session
+                    instance = factory(session=ScopedSession)
+        return instance
+    return get
+
+_user_service = _singleton(UserService)
+_content_service = _singleton(ContentService)
+_workshop_service = _singleton(WorkshopService)
+_product_service = _singleton(ProductService)
+_payment_service = _singleton(PaymentService)
+
 class DatabaseManager:
     """Manager class for database operations"""
     
-    def __init__(self):
-        self._user_service = None
-        self._content_service = None
-        self._workshop_service = None
-        self._product_service = None
-        self._payment_service = None
+    __slots__ = ()
     
     @property
     def users(self):
         """Get user service"""
-        if not self._user_service:
-            self._user_service = UserService()
-        return self._user_service
+        return _user_service()
     
     @property
     def content(self):
         """Get content service"""
-        if not self._content_service:
-            self._content_service = ContentService()
-        return self._content_service
+        return _content_service()
     
     @property
     def workshops(self):
         """Get workshop service"""
-        if not self._workshop_service:
-            self._workshop_service = WorkshopService()
-        return self._workshop_service
+        return _workshop_service()
     
     @property
     def products(self):
         """Get product service"""
-        if not self._product_service:
-            self._product_service = ProductService()
-        return self._product_service
+        return _product_service()
     
     @property
     def payments(self):
         """Get payment service"""
-        if not self._payment_service:
-            self._payment_service = PaymentService()
-        return self._payment_service
+        return _payment_service()
     
     def initialize_database(self):
         """Initialize the database"""
@@ -106,18 +115,18 @@ def get_payment_service():
 
 # Django middleware integration
 class SQLAlchemyMiddleware:
-    """Middleware to handle SQLAlchemy sessions"""
+    """Middleware that scopes one SQLAlchemy session to each request"""
     
     def __init__(self, get_response):
         self.get_response = get_response
     
     def __call__(self, request):
-        # Add database manager to request
+        # Add database manager and the request's session to request
         request.db = db_manager
+        request.db_session = ScopedSession()
         
-        response = self.get_response(request)
-        
-        # Clean up any open sessions
-        # (Services handle their own session cleanup)
-        
-        return response
\ No newline at end of file
+        try:
+            return self.get_response(request)
+        finally:
+            # One session per request: services share it, released here
+            ScopedSession.remove()
\ No newline at end of file
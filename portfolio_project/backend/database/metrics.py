@@ -0,0 +1,46 @@
+"""
+Prometheus exporter for dashboard analytics
+"""
+from prometheus_client import CollectorRegistry
+from prometheus_client.core import GaugeMetricFamily
+from database.analytics import AnalyticsService
+
+DASHBOARD_METRICS_DAYS = 30
+
+# (metric name, help text, section, key) for each value of get_dashboard_metrics()
+DASHBOARD_GAUGES = [
+    ('portfolio_revenue_total', 'Revenue over the dashboard window', 'revenue', 'total'),
+    ('portfolio_revenue_daily_average', 'Average daily revenue over the dashboard window', 'revenue', 'daily_average'),
+    ('portfolio_revenue_transactions', 'Transactions over the dashboard window', 'revenue', 'transactions'),
+    ('portfolio_users_total', 'Users with analytics records', 'users', 'total'),
+    ('portfolio_users_workshop_attendees', 'Workshop attendances across all users', 'users', 'workshop_attendees'),
+    ('portfolio_users_course_purchases', 'Course purchases across all users', 'users', 'course_purchases'),
+    ('portfolio_workshops_total', 'Workshops in the dashboard window', 'workshops', 'total'),
+    ('portfolio_workshops_registrations', 'Workshop registrations in the dashboard window', 'workshops', 'registrations'),
+    ('portfolio_workshops_completion_rate', 'Average workshop attendance rate (percent)', 'workshops', 'completion_rate'),
+    ('portfolio_content_views', 'Content views across all pieces', 'content', 'total_views'),
+    ('portfolio_content_avg_time_on_page', 'Average time on page (seconds)', 'content', 'avg_time_on_page'),
+    ('portfolio_content_pieces', 'Content pieces with analytics records', 'content', 'total_pieces'),
+]
+
+class DashboardMetricsCollector:
+    """Expose get_dashboard_metrics() as gauges at scrape time.
+    
+    The values come from the analytics cache, so scrapes hit TiDB at most
+    once per ANALYTICS_CACHE_TTL however often Prometheus polls.
+    """
+    
+    def collect(self):
+        with AnalyticsService() as analytics:
+            metrics = analytics.get_dashboard_metrics(DASHBOARD_METRICS_DAYS)
+        
+        if not metrics:
+            return
+        
+        for name, documentation, section, key in DASHBOARD_GAUGES:
+            gauge = GaugeMetricFamily(name, documentation)
+            gauge.add_metric([], metrics[section][key])
+            yield gauge
+
+registry = CollectorRegistry(auto_describe=False)
+registry.register(DashboardMetricsCollector())
@@ -10,7 +10,9 @@ from .contact_models import ContactMessage
 from .achievement_models import Achievement
 from .analytics_models import (
     UserAnalytics, WorkshopAnalytics, ContentAnalytics, 
-    RevenueAnalytics, NewsletterAnalytics, TradingServiceAnalytics
+    RevenueAnalytics, RevenueWeeklyRollup, UserBehaviorLog, UserBehaviorHourly,
+    MarketingCampaignAnalytics,
+    NewsletterAnalytics, TradingServiceAnalytics
 )
 
 __all__ = [
@@ -22,5 +24,7 @@ __all__ = [
     'ContactMessage',
     'Achievement',
     'UserAnalytics', 'WorkshopAnalytics', 'ContentAnalytics',
-    'RevenueAnalytics', 'NewsletterAnalytics', 'TradingServiceAnalytics'
+    'RevenueAnalytics', 'RevenueWeeklyRollup', 'UserBehaviorLog', 'UserBehaviorHourly',
+    'MarketingCampaignAnalytics',
+    'NewsletterAnalytics', 'TradingServiceAnalytics'
 ]
\ No newline at end of file
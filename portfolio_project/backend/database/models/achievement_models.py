@@ -10,7 +10,7 @@ class Achievement(Base):
     """Achievement model"""
     __tablename__ = 'portfolio_app_achievement'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
     date = Column(Date, nullable=False)
@@ -21,8 +21,8 @@ class Achievement(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
-    # Relationships
-    user = relationship("User", back_populates="achievements")
+    # Relationships (load explicitly with selectinload(Achievement.user))
+    user = relationship("User", back_populates="achievements", lazy='raise')
     
     __table_args__ = (
         Index('idx_achievement_user', 'user_id'),
@@ -30,4 +30,5 @@ class Achievement(Base):
     )
     
     def __repr__(self):
-        return f"<Achievement {self.title} - {self.user.username if self.user else 'Unknown'}>"
\ No newline at end of file
+        # user_id, not user.username: a repr must never trigger (or raise on) a load
+        return f"<Achievement {self.title} - user {self.user_id}>"
\ No newline at end of file
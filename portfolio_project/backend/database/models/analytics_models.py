@@ -2,19 +2,70 @@
 Analytics-related SQLAlchemy Models
 These models are optimized for analytics, reporting, and data warehousing
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey, Index, Date, Numeric
+from sqlalchemy import (
+    DDL, BigInteger, Column, Integer, String, Text, DateTime, Boolean, JSON, ForeignKey, Index, Date,
+    Numeric, Enum, FetchedValue, event, text
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database.config import Base
+from .column_types import IPAddress, JSONDocument
 
+def _gin_index(name, column):
+    """GIN (jsonb_path_ops) index for @> containment filters; only created on PostgreSQL"""
+    return Index(
+        name, column,
+        postgresql_using='gin',
+        postgresql_ops={column: 'jsonb_path_ops'},
+    ).ddl_if(dialect='postgresql')
+
+def _brin_index(name, column):
+    """BRIN index for an append-only, monotonic column; only created on PostgreSQL"""
+    return Index(
+        name, column,
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32},
+    ).ddl_if(dialect='postgresql')
+
+# PostgreSQL has no ON UPDATE column clause, so a shared trigger function stamps the rows
+event.listen(Base.metadata, 'before_create', DDL("""
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+""").execute_if(dialect='postgresql'))
+
+def _maintain_updated_at(model):
+    """Have the database stamp updated_at on every UPDATE instead of the ORM"""
+    event.listen(model.__table__, 'after_create', DDL(
+        "ALTER TABLE %(table)s MODIFY updated_at DATETIME "
+        "DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"
+    ).execute_if(dialect='mysql'))
+    event.listen(model.__table__, 'after_create', DDL(
+        "CREATE TRIGGER set_updated_at BEFORE UPDATE ON %(table)s "
+        "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+    ).execute_if(dialect='postgresql'))
+    return model
+
+def _hot_update_fillfactor(model, fillfactor=70):
+    """Leave page space for HOT updates on rows rewritten by every sync; PostgreSQL only"""
+    event.listen(model.__table__, 'after_create', DDL(
+        f"ALTER TABLE %(table)s SET (fillfactor = {fillfactor})"
+    ).execute_if(dialect='postgresql'))
+    return model
+
+@_hot_update_fillfactor
+@_maintain_updated_at
 class UserAnalytics(Base):
     """User analytics and behavior tracking"""
     __tablename__ = 'user_analytics'
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, index=True)  # Reference to Django User ID
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer)  # Reference to Django User ID
     username = Column(String(150), index=True)
-    email = Column(String(254), index=True)
+    email = Column(String(254))
     registration_date = Column(DateTime)
     last_login = Column(DateTime)
     
@@ -29,7 +80,7 @@ class UserAnalytics(Base):
     
     # Timestamps
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), server_onupdate=FetchedValue())
     
     # Indexes for performance
     __table_args__ = (
@@ -38,12 +89,13 @@ class UserAnalytics(Base):
         Index('idx_user_analytics_registration', 'registration_date'),
     )
 
+@_maintain_updated_at
 class WorkshopAnalytics(Base):
     """Workshop performance and attendance analytics"""
     __tablename__ = 'workshop_analytics'
     
-    id = Column(Integer, primary_key=True, index=True)
-    workshop_id = Column(Integer, index=True)  # Reference to Django Workshop ID
+    id = Column(Integer, primary_key=True)
+    workshop_id = Column(Integer)  # Reference to Django Workshop ID
     workshop_title = Column(String(200))
     workshop_type = Column(String(50))  # 'paid', 'free'
     workshop_date = Column(DateTime)
@@ -56,21 +108,23 @@ class WorkshopAnalytics(Base):
     
     # Timestamps
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), server_onupdate=FetchedValue())
     
     # Indexes
     __table_args__ = (
         Index('idx_workshop_analytics_workshop_id', 'workshop_id'),
-        Index('idx_workshop_analytics_date', 'workshop_date'),
+        # Covers the dashboard's workshop_date range + aggregates without row lookups
+        Index('idx_workshop_analytics_date', 'workshop_date', 'total_registrations', 'confirmed_attendees'),
         Index('idx_workshop_analytics_type', 'workshop_type'),
     )
 
+@_maintain_updated_at
 class ContentAnalytics(Base):
     """Blog post and content performance analytics"""
     __tablename__ = 'content_analytics'
     
-    id = Column(Integer, primary_key=True, index=True)
-    content_id = Column(Integer, index=True)  # Reference to Django content ID
+    id = Column(Integer, primary_key=True)
+    content_id = Column(Integer)  # Reference to Django content ID
     content_type = Column(String(50))  # 'blog_post', 'newsletter', etc.
     title = Column(String(200))
     category = Column(String(100))
@@ -89,34 +143,36 @@ class ContentAnalytics(Base):
     # Timestamps
     publish_date = Column(DateTime)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), server_onupdate=FetchedValue())
     
     # Indexes
     __table_args__ = (
         Index('idx_content_analytics_content_id', 'content_id'),
         Index('idx_content_analytics_type', 'content_type'),
-        Index('idx_content_analytics_views', 'total_views'),
+        # Serves ORDER BY total_views DESC LIMIT n for top content
+        Index('idx_content_analytics_views', total_views.desc()),
         Index('idx_content_analytics_trending', 'trending_score'),
     )
 
+@_maintain_updated_at
 class RevenueAnalytics(Base):
     """Daily revenue and financial analytics"""
     __tablename__ = 'revenue_analytics'
     
-    id = Column(Integer, primary_key=True, index=True)
-    date = Column(Date, unique=True, index=True)
+    id = Column(Integer, primary_key=True)
+    date = Column(Date, unique=True)
     
     # Time dimensions
-    year = Column(Integer, index=True)
+    year = Column(Integer)  # leading column of idx_revenue_analytics_year_month
     month = Column(Integer, index=True)
     week = Column(Integer, index=True)
     day_of_week = Column(Integer, index=True)
     
-    # Revenue by source
-    workshop_revenue = Column(Numeric(10, 2), default=0)
-    product_revenue = Column(Numeric(10, 2), default=0)
-    service_revenue = Column(Numeric(10, 2), default=0)
-    total_revenue = Column(Numeric(10, 2), default=0)
+    # Revenue by source, in integer cents (paise) so SUM/AVG run on BIGINT
+    workshop_revenue_cents = Column(BigInteger, default=0)
+    product_revenue_cents = Column(BigInteger, default=0)
+    service_revenue_cents = Column(BigInteger, default=0)
+    total_revenue_cents = Column(BigInteger, default=0)
     
     # Transaction metrics
     total_transactions = Column(Integer, default=0)
@@ -125,21 +181,147 @@ class RevenueAnalytics(Base):
     
     # Timestamps
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), server_onupdate=FetchedValue())
     
     # Indexes
     __table_args__ = (
-        Index('idx_revenue_analytics_date', 'date'),
         Index('idx_revenue_analytics_year_month', 'year', 'month'),
-        Index('idx_revenue_analytics_total', 'total_revenue'),
+        Index('idx_revenue_analytics_total', 'total_revenue_cents'),
+        # Covers the dashboard's date range SUM/AVG and the revenue trend projection so
+        # both are answered from the index (MySQL has no INCLUDE; trailing key columns do the job)
+        Index(
+            'idx_revenue_analytics_trends_covering',
+            'date', 'total_revenue_cents', 'total_transactions',
+            'workshop_revenue_cents', 'product_revenue_cents', 'service_revenue_cents'
+        ),
+    )
+
+@_maintain_updated_at
+class RevenueWeeklyRollup(Base):
+    """Weekly revenue totals rolled up from revenue_analytics"""
+    __tablename__ = 'revenue_weekly_rollup'
+    
+    # Monday of the ISO week
+    week_start = Column(Date, primary_key=True)
+    year = Column(Integer)
+    week = Column(Integer)
+    
+    # Integer cents, like revenue_analytics
+    workshop_revenue_cents = Column(BigInteger, default=0)
+    product_revenue_cents = Column(BigInteger, default=0)
+    service_revenue_cents = Column(BigInteger, default=0)
+    total_revenue_cents = Column(BigInteger, default=0)
+    total_transactions = Column(Integer, default=0)
+    
+    updated_at = Column(DateTime, server_default=func.now(), server_onupdate=FetchedValue())
+
+class UserBehaviorLog(Base):
+    """Detailed user behavior and activity logging"""
+    __tablename__ = 'user_behavior_log'
+    
+    # The partition column has to be part of the primary key; append-only at
+    # event rate, so a 32-bit id would run out
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    timestamp = Column(DateTime, primary_key=True, default=func.now())
+    user_id = Column(Integer)
+    session_id = Column(String(100), index=True)
+    
+    # Activity details
+    action_type = Column(String(50))  # page_view, click, download, etc.
+    page_url = Column(String(500))
+    referrer_url = Column(String(500))
+    action_details = Column(JSONDocument)  # Additional action-specific data
+    
+    # Context data
+    user_agent = Column(Text)
+    ip_address = Column(IPAddress())
+    device_type = Column(Enum('desktop', 'mobile', 'tablet', 'other', name='device_type_enum'))
+    browser = Column(String(50))
+    operating_system = Column(String(50))
+    
+    session_duration = Column(Integer)  # in seconds
+    
+    # Indexes are partition-local; setup_tidb.py rolls the monthly window forward
+    __table_args__ = (
+        Index('idx_user_activity', 'user_id', 'timestamp'),
+        Index('idx_action_analysis', 'action_type', 'timestamp'),
+        _gin_index('idx_behavior_details_gin', 'action_details'),
+        # TiDB prunes timestamp ranges by partition instead
+        _brin_index('idx_behavior_ts_brin', 'timestamp'),
+        {
+            'mysql_partition_by': (
+                "RANGE COLUMNS(`timestamp`) INTERVAL (1 MONTH) "
+                "FIRST PARTITION LESS THAN ('2025-01-01') "
+                "LAST PARTITION LESS THAN ('2028-01-01')"
+            ),
+        },
+    )
+
+class UserBehaviorHourly(Base):
+    """Hourly action counts rolled up from user_behavior_log"""
+    __tablename__ = 'user_behavior_hourly'
+    
+    hour = Column(DateTime, primary_key=True)  # Truncated to the start of the hour
+    user_id = Column(Integer, primary_key=True, default=0)  # 0 for anonymous visitors
+    action_type = Column(String(50), primary_key=True)
+    n = Column(Integer, default=0)
+    
+    __table_args__ = (
+        Index('idx_behavior_hourly_action', 'action_type', 'hour', 'n'),
+    )
+
+@_maintain_updated_at
+class MarketingCampaignAnalytics(Base):
+    """Marketing campaign performance tracking"""
+    __tablename__ = 'marketing_campaign_analytics'
+    
+    id = Column(Integer, primary_key=True)
+    campaign_id = Column(String(100), unique=True)
+    campaign_name = Column(String(255), index=True)
+    campaign_type = Column(String(50))  # email, social, paid_ads, etc.
+    
+    # Campaign metrics
+    impressions = Column(Integer, default=0)
+    clicks = Column(Integer, default=0)
+    conversions = Column(Integer, default=0)
+    click_through_rate = Column(Numeric(5, 2), default=0)
+    conversion_rate = Column(Numeric(5, 2), default=0)
+    
+    # Financial metrics
+    cost = Column(Numeric(10, 2), default=0)
+    revenue = Column(Numeric(10, 2), default=0)
+    roi = Column(Numeric(8, 2), default=0)
+    cost_per_click = Column(Numeric(8, 2), default=0)
+    cost_per_conversion = Column(Numeric(8, 2), default=0)
+    
+    # Audience data
+    target_audience = Column(JSONDocument)
+    demographics = Column(JSONDocument)
+    geographic_data = Column(JSONDocument)
+    
+    # Campaign timing
+    start_date = Column(DateTime, index=True)
+    end_date = Column(DateTime, index=True)
+    is_active = Column(Boolean, default=True)
+    
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), server_onupdate=FetchedValue())
+    
+    __table_args__ = (
+        Index('idx_campaign_performance', 'campaign_type', 'conversion_rate'),
+        Index('idx_campaign_roi', 'roi', 'start_date'),
+        Index('idx_active_campaigns', 'is_active', 'start_date', postgresql_where=text('is_active')),
+        _gin_index('idx_campaign_audience_gin', 'target_audience'),
+        _gin_index('idx_campaign_demographics_gin', 'demographics'),
     )
 
+@_maintain_updated_at
 class NewsletterAnalytics(Base):
     """Newsletter performance analytics"""
     __tablename__ = 'newsletter_analytics'
     
-    id = Column(Integer, primary_key=True, index=True)
-    newsletter_id = Column(Integer, index=True)  # Reference to Django Newsletter ID
+    id = Column(Integer, primary_key=True)
+    newsletter_id = Column(Integer)  # Reference to Django Newsletter ID
     subject = Column(String(200))
     
     # Delivery metrics
@@ -161,7 +343,7 @@ class NewsletterAnalytics(Base):
     # Timestamps
     sent_date = Column(DateTime)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), server_onupdate=FetchedValue())
     
     # Indexes
     __table_args__ = (
@@ -170,15 +352,17 @@ class NewsletterAnalytics(Base):
         Index('idx_newsletter_analytics_open_rate', 'open_rate'),
     )
 
+@_hot_update_fillfactor
+@_maintain_updated_at
 class TradingServiceAnalytics(Base):
     """Trading service performance analytics"""
     __tablename__ = 'trading_service_analytics'
     
-    id = Column(Integer, primary_key=True, index=True)
-    service_id = Column(Integer, index=True)  # Reference to Django TradingService ID
+    id = Column(Integer, primary_key=True)
+    service_id = Column(Integer)  # Reference to Django TradingService ID
     service_name = Column(String(200))
     service_type = Column(String(100))
-    date = Column(Date, index=True)
+    date = Column(Date)
     
     # Subscription metrics
     active_subscribers = Column(Integer, default=0)
@@ -195,11 +379,12 @@ class TradingServiceAnalytics(Base):
     
     # Timestamps
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), server_onupdate=FetchedValue())
     
     # Indexes
     __table_args__ = (
         Index('idx_trading_service_analytics_service_id', 'service_id'),
-        Index('idx_trading_service_analytics_date', 'date'),
-        Index('idx_trading_service_analytics_revenue', 'monthly_recurring_revenue'),
+        # B-tree on TiDB; a BRIN is a fraction of the size on PostgreSQL
+        Index('idx_trading_service_analytics_date', 'date').ddl_if(dialect='mysql'),
+        _brin_index('idx_trading_service_analytics_date_brin', 'date'),
     )
\ No newline at end of file
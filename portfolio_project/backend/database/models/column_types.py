@@ -0,0 +1,70 @@
+"""
+Custom SQLAlchemy column types shared by the models
+"""
+import ipaddress
+import zlib
+from sqlalchemy import JSON, LargeBinary
+from sqlalchemy.dialects.mysql import LONGBLOB, VARBINARY
+from sqlalchemy.dialects.postgresql import INET, JSONB
+from sqlalchemy.types import TypeDecorator
+
+# MySQL/TiDB already store JSON in a parsed binary format; on PostgreSQL use JSONB
+# rather than text-backed JSON so documents aren't reparsed on every read
+JSONDocument = JSON().with_variant(JSONB(), 'postgresql')
+
+class CompressedText(TypeDecorator):
+    """Text stored zlib-compressed in a binary column, decompressed on load"""
+    impl = LargeBinary
+    cache_ok = True
+    
+    def __init__(self, level: int = 6, **kwargs):
+        super().__init__(**kwargs)
+        self.level = level
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'mysql':
+            return dialect.type_descriptor(LONGBLOB())
+        return dialect.type_descriptor(LargeBinary())
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return zlib.compress(value.encode('utf-8'), self.level)
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return value
+        try:
+            return zlib.decompress(value).decode('utf-8')
+        except zlib.error:
+            # Rows written before the column was compressed
+            return bytes(value).decode('utf-8')
+
+class IPAddress(TypeDecorator):
+    """IPv4/IPv6 address: 4/16 packed bytes on MySQL/TiDB, native INET on PostgreSQL"""
+    impl = LargeBinary
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(INET())
+        if dialect.name == 'mysql':
+            return dialect.type_descriptor(VARBINARY(16))
+        return dialect.type_descriptor(LargeBinary(16))
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        address = ipaddress.ip_address(value)
+        if dialect.name == 'postgresql':
+            return str(address)
+        return address.packed
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return value
+        return str(ipaddress.ip_address(bytes(value)))
@@ -1,7 +1,7 @@
 """
 Contact and Communication-related SQLAlchemy Models
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, Computed
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database.config import Base
@@ -10,7 +10,7 @@ class ContactMessage(Base):
     """Contact message model"""
     __tablename__ = 'portfolio_app_contactmessage'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
     email = Column(String(254), nullable=False)
     subject = Column(String(255), nullable=False)
@@ -34,23 +34,24 @@ class ContactMessage(Base):
     ip_address = Column(String(45), nullable=True)
     user_agent = Column(Text, nullable=True)
     
+    # Stored generated column (Django GeneratedField), filterable in SQL
+    is_urgent = Column(Boolean, Computed("priority IN ('high', 'urgent')", persisted=True))
+    
     # Relationships
     assigned_to = relationship("User")
     
     __table_args__ = (
-        Index('idx_contact_status', 'status'),
         Index('idx_contact_priority', 'priority'),
         Index('idx_contact_email', 'email'),
         Index('idx_contact_created_at', 'created_at'),
+        # Keyset pages of the inbox seek on (created_at, id), optionally within a status
+        Index('idx_contact_status_created', 'status', 'created_at', 'id'),
+        Index('contact_urgent_created_idx', 'is_urgent', 'created_at'),
     )
     
     @property
     def is_new(self):
         return self.status == 'new'
     
-    @property
-    def is_urgent(self):
-        return self.priority in ['high', 'urgent']
-    
     def __repr__(self):
         return f"<ContactMessage {self.name} - {self.subject}>"
\ No newline at end of file
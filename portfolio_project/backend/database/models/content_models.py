@@ -1,10 +1,13 @@
 """
 Content-related SQLAlchemy Models
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, Table, text, and_
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
 from database.config import Base
+from .column_types import CompressedText
+from datetime import datetime
 import uuid
 
 # Association table for blog post tags (many-to-many)
@@ -19,7 +22,7 @@ class BlogCategory(Base):
     """Blog category model"""
     __tablename__ = 'portfolio_app_blogcategory'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(100), unique=True, nullable=False)
     slug = Column(String(100), unique=True, nullable=False)
     description = Column(Text, nullable=True)
@@ -35,7 +38,7 @@ class BlogTag(Base):
     """Blog tag model"""
     __tablename__ = 'portfolio_app_blogtag'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(50), unique=True, nullable=False)
     slug = Column(String(50), unique=True, nullable=False)
     created_at = Column(DateTime, default=func.now())
@@ -50,7 +53,7 @@ class BlogPost(Base):
     """Blog post model"""
     __tablename__ = 'portfolio_app_blogpost'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     title = Column(String(255), nullable=False)
     slug = Column(String(255), unique=True, nullable=False)
     author_id = Column(Integer, ForeignKey('auth_user.id'), nullable=False)
@@ -58,7 +61,8 @@ class BlogPost(Base):
     
     # Content fields
     excerpt = Column(Text, nullable=False)
-    content = Column(Text, nullable=False)
+    # Only the detail page renders the body; list queries leave it on the server
+    content = deferred(Column(Text, nullable=False))
     featured_image = Column(String(255), nullable=True)
     
     # SEO fields
@@ -76,20 +80,33 @@ class BlogPost(Base):
     is_featured = Column(Boolean, default=False)
     
     # Relationships
-    author = relationship("User")
-    category = relationship("BlogCategory", back_populates="posts")
-    tags = relationship("BlogTag", secondary=blog_post_tags, back_populates="posts")
+    # Never lazy-loaded: list queries must ask for them (selectinload) up front
+    author = relationship("User", lazy='raise')
+    category = relationship("BlogCategory", back_populates="posts", lazy='raise')
+    tags = relationship("BlogTag", secondary=blog_post_tags, back_populates="posts", lazy='raise')
     
     __table_args__ = (
-        Index('idx_blogpost_status', 'status'),
+        # Partial on PostgreSQL; on TiDB the filter column leads instead
+        Index(
+            'idx_blogpost_published', 'status', 'publish_date',
+            postgresql_where=text("status = 'published'")
+        ),
         Index('idx_blogpost_publish_date', 'publish_date'),
-        Index('idx_blogpost_featured', 'is_featured'),
+        Index(
+            'idx_blogpost_featured_published', 'is_featured', 'status', 'publish_date',
+            postgresql_where=text("status = 'published' AND is_featured")
+        ),
         Index('idx_blogpost_author', 'author_id'),
     )
     
-    @property
+    @hybrid_property
     def is_published(self):
-        return self.status == 'published' and self.publish_date <= func.now()
+        return self.status == 'published' and self.publish_date <= datetime.now()
+    
+    @is_published.expression
+    def is_published(cls):
+        # Time-dependent, so it can't be a generated column; push the filter down instead
+        return and_(cls.status == 'published', cls.publish_date <= func.now())
     
     def __repr__(self):
         return f"<BlogPost {self.title}>"
@@ -98,7 +115,7 @@ class Subscriber(Base):
     """Newsletter subscriber model"""
     __tablename__ = 'portfolio_app_subscriber'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     email = Column(String(254), unique=True, nullable=False)
     name = Column(String(100), nullable=True)
     confirmation_token = Column(String(36), unique=True, nullable=False)
@@ -108,7 +125,7 @@ class Subscriber(Base):
     is_active = Column(Boolean, default=True)
     
     __table_args__ = (
-        Index('idx_subscriber_email', 'email'),
+        Index('idx_subscriber_email_lower', func.lower(email)),
         Index('idx_subscriber_confirmed', 'is_confirmed'),
         Index('idx_subscriber_active', 'is_active'),
     )
@@ -120,17 +137,18 @@ class Newsletter(Base):
     """Newsletter model"""
     __tablename__ = 'portfolio_app_newsletter'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     subject = Column(String(255), nullable=False)
-    content_html = Column(Text, nullable=False)
-    content_text = Column(Text, nullable=True)
+    # Repetitive HTML/text bodies compress ~6-8x; stored as zlib LONGBLOBs
+    content_html = Column(CompressedText(), nullable=False)
+    content_text = Column(CompressedText(), nullable=True)
     created_at = Column(DateTime, default=func.now())
     sent_at = Column(DateTime, nullable=True)
     is_sent = Column(Boolean, default=False)
     sent_to_count = Column(Integer, default=0)
     
     __table_args__ = (
-        Index('idx_newsletter_sent', 'is_sent'),
+        Index('idx_newsletter_sent_at', 'is_sent', 'sent_at', postgresql_where=text('is_sent')),
         Index('idx_newsletter_created', 'created_at'),
     )
     
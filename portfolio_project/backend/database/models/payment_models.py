@@ -1,8 +1,10 @@
 """
 Payment-related SQLAlchemy Models
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, Numeric, JSON
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, Numeric, JSON, and_, or_
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
 from database.config import Base
 
@@ -10,7 +12,7 @@ class Payment(Base):
     """Payment model"""
     __tablename__ = 'portfolio_app_payment'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     payment_id = Column(String(100), unique=True, nullable=False)
     amount = Column(Numeric(10, 2), nullable=False)
     currency = Column(String(3), default='INR')
@@ -38,15 +40,22 @@ class Payment(Base):
     completed_at = Column(DateTime, nullable=True)
     
     # Relationships
-    workshop_application = relationship("WorkshopApplication")
-    digital_product = relationship("DigitalProduct")
-    trading_service = relationship("TradingService")
+    # Batched per result set (one IN query each) rather than one SELECT per row
+    workshop_application = relationship("WorkshopApplication", lazy="selectin")
+    digital_product = relationship("DigitalProduct", lazy="selectin")
+    trading_service = relationship("TradingService", lazy="selectin")
     
     __table_args__ = (
-        Index('idx_payment_status', 'status'),
-        Index('idx_payment_type', 'payment_type'),
-        Index('idx_payment_customer_email', 'customer_email'),
         Index('idx_payment_created_at', 'created_at'),
+        # Filter column first, then the created_at the listings sort on
+        Index('idx_payment_status_created', 'status', 'created_at'),
+        Index('idx_payment_type_created', 'payment_type', 'created_at'),
+        # Emails are matched case-insensitively, so the index is on lower(customer_email);
+        # on PostgreSQL the INCLUDE columns let payment history be an index-only scan
+        Index(
+            'idx_payment_customer_email_lower', func.lower(customer_email), 'created_at',
+            postgresql_include=['payment_id', 'amount', 'status', 'payment_type']
+        ),
     )
     
     def __repr__(self):
@@ -56,7 +65,7 @@ class PurchasedCourse(Base):
     """Purchased course model"""
     __tablename__ = 'portfolio_app_purchasedcourse'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('auth_user.id'), nullable=False)
     course_name = Column(String(255), nullable=False)
     course_type = Column(String(50), nullable=False)
@@ -89,19 +98,26 @@ class PurchasedCourse(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
     # Relationships
-    user = relationship("User", back_populates="purchased_courses")
-    workshop_application = relationship("WorkshopApplication")
-    trading_service = relationship("TradingService", back_populates="purchased_courses")
+    # Batched per result set (one IN query each) rather than one SELECT per row
+    user = relationship("User", back_populates="purchased_courses", lazy="selectin")
+    workshop_application = relationship("WorkshopApplication", lazy="selectin")
+    trading_service = relationship("TradingService", back_populates="purchased_courses", lazy="selectin")
     
     __table_args__ = (
-        Index('idx_purchased_course_user', 'user_id'),
         Index('idx_purchased_course_status', 'status'),
         Index('idx_purchased_course_purchase_date', 'purchase_date'),
+        # get_active_courses: equality on both, ordered by purchase_date
+        Index('idx_purchased_course_user_status', 'user_id', 'status', 'purchase_date'),
+        Index('idx_purchased_course_user_date', 'user_id', 'purchase_date'),
     )
     
-    @property
+    @hybrid_property
     def is_active(self):
-        return self.status == 'active' and (not self.end_date or self.end_date > func.now())
+        return self.status == 'active' and (not self.end_date or self.end_date > datetime.now())
+    
+    @is_active.expression
+    def is_active(cls):
+        return and_(cls.status == 'active', or_(cls.end_date.is_(None), cls.end_date > func.now()))
     
     def __repr__(self):
-        return f"<PurchasedCourse {self.course_name} - {self.user.username if self.user else 'Unknown'}>"
\ No newline at end of file
+        return f"<PurchasedCourse {self.course_name} - user {self.user_id}>"
\ No newline at end of file
@@ -1,7 +1,7 @@
 """
 Product and Service-related SQLAlchemy Models
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, Numeric, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, Numeric, JSON, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database.config import Base
@@ -10,7 +10,7 @@ class DigitalProduct(Base):
     """Digital product model"""
     __tablename__ = 'portfolio_app_digitalproduct'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
     price = Column(Numeric(10, 2), nullable=False)
@@ -27,7 +27,7 @@ class TradingService(Base):
     """Trading service model"""
     __tablename__ = 'portfolio_app_tradingservice'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(255), nullable=False)
     slug = Column(String(255), unique=True, nullable=False)
     service_type = Column(String(20), default='signals')
@@ -68,8 +68,19 @@ class TradingService(Base):
     purchased_courses = relationship("PurchasedCourse", back_populates="trading_service")
     
     __table_args__ = (
-        Index('idx_service_active', 'is_active'),
-        Index('idx_service_featured', 'is_featured'),
+        # Listings only show active services: partial on PostgreSQL, flag-leading on TiDB
+        Index(
+            'idx_service_active_order', 'is_active', 'display_order',
+            postgresql_where=text('is_active')
+        ),
+        Index(
+            'idx_service_featured_order', 'is_featured', 'is_active', 'display_order',
+            postgresql_where=text('is_active AND is_featured')
+        ),
+        Index(
+            'idx_service_popular_order', 'is_popular', 'is_active', 'display_order',
+            postgresql_where=text('is_active AND is_popular')
+        ),
         Index('idx_service_display_order', 'display_order'),
         Index('idx_service_type', 'service_type'),
     )
@@ -81,7 +92,7 @@ class ServiceBooking(Base):
     """Service booking model"""
     __tablename__ = 'portfolio_app_servicebooking'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     service_id = Column(Integer, ForeignKey('portfolio_app_tradingservice.id'), nullable=False)
     name = Column(String(100), nullable=False)
     email = Column(String(254), nullable=False)
@@ -102,13 +113,14 @@ class ServiceBooking(Base):
     contacted_at = Column(DateTime, nullable=True)
     
     # Relationships
-    service = relationship("TradingService", back_populates="bookings")
+    service = relationship("TradingService", back_populates="bookings", lazy="selectin")
     
     __table_args__ = (
-        Index('idx_booking_service', 'service_id'),
-        Index('idx_booking_status', 'status'),
         Index('idx_booking_created_at', 'created_at'),
+        # Bookings are listed newest first, per service or per status
+        Index('idx_booking_service_created', 'service_id', 'created_at'),
+        Index('idx_booking_status_created', 'status', 'created_at'),
     )
     
     def __repr__(self):
-        return f"<ServiceBooking {self.name} - {self.service.name if self.service else 'Unknown'}>"
\ No newline at end of file
+        return f"<ServiceBooking {self.name} - service {self.service_id}>"
\ No newline at end of file
@@ -1,19 +1,25 @@
 """
 User-related SQLAlchemy Models
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, and_, case
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
 from database.config import Base
-from werkzeug.security import generate_password_hash, check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerifyMismatchError
+from werkzeug.security import check_password_hash
+
+# Argon2id in libargon2 (C); werkzeug is only kept to verify legacy PBKDF2/scrypt hashes
+_password_hasher = PasswordHasher()
 
 class User(Base):
     """User model - mirrors Django User"""
     __tablename__ = 'auth_user'
     
-    id = Column(Integer, primary_key=True, index=True)
-    username = Column(String(150), unique=True, index=True, nullable=False)
-    email = Column(String(254), unique=True, index=True, nullable=False)
+    id = Column(Integer, primary_key=True)
+    username = Column(String(150), unique=True, nullable=False)
+    email = Column(String(254), unique=True, nullable=False)
     first_name = Column(String(150), nullable=True)
     last_name = Column(String(150), nullable=True)
     password_hash = Column(String(128), nullable=False)
@@ -24,31 +30,52 @@ class User(Base):
     last_login = Column(DateTime, nullable=True)
     
     # Relationships
-    profile = relationship("UserProfile", back_populates="user", uselist=False)
+    # One-to-one and read with nearly every user, so it rides along as a LEFT OUTER JOIN
+    # cascade='all': the profile is saved and deleted with its user (Django's on_delete=CASCADE)
+    profile = relationship("UserProfile", back_populates="user", uselist=False, lazy='joined', cascade='all')
     achievements = relationship("Achievement", back_populates="user")
     purchased_courses = relationship("PurchasedCourse", back_populates="user")
     
     __table_args__ = (
-        Index('idx_user_email', 'email'),
-        Index('idx_user_username', 'username'),
+        Index('idx_user_email_lower', func.lower(email)),
         Index('idx_user_active', 'is_active'),
     )
     
     def set_password(self, password):
         """Set password hash"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = _password_hasher.hash(password)
     
     def check_password(self, password):
-        """Check password"""
-        return check_password_hash(self.password_hash, password)
+        """Check password, re-hashing legacy or outdated hashes to current Argon2 parameters"""
+        if self.password_hash.startswith('$argon2'):
+            try:
+                _password_hasher.verify(self.password_hash, password)
+            except (VerifyMismatchError, InvalidHashError):
+                return False
+            if _password_hasher.check_needs_rehash(self.password_hash):
+                self.set_password(password)
+            return True
+        
+        if check_password_hash(self.password_hash, password):
+            self.set_password(password)
+            return True
+        return False
     
-    @property
+    @hybrid_property
     def full_name(self):
         """Get full name"""
         if self.first_name and self.last_name:
             return f"{self.first_name} {self.last_name}"
         return self.username
     
+    @full_name.expression
+    def full_name(cls):
+        # Same rule in SQL, so listings can select the display name as one column
+        return case(
+            (and_(cls.first_name != '', cls.last_name != ''), cls.first_name + ' ' + cls.last_name),
+            else_=cls.username
+        )
+    
     def __repr__(self):
         return f"<User {self.username}>"
 
@@ -56,7 +83,7 @@ class UserProfile(Base):
     """User profile model - mirrors Django UserProfile"""
     __tablename__ = 'portfolio_app_userprofile'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('auth_user.id'), unique=True, nullable=False)
     phone = Column(String(20), nullable=True)
     date_of_birth = Column(DateTime, nullable=True)
@@ -80,9 +107,8 @@ class UserProfile(Base):
     user = relationship("User", back_populates="profile")
     
     __table_args__ = (
-        Index('idx_profile_user', 'user_id'),
         Index('idx_profile_experience', 'trading_experience'),
     )
     
     def __repr__(self):
-        return f"<UserProfile for {self.user.username if self.user else 'Unknown'}>"
\ No newline at end of file
+        return f"<UserProfile for user {self.user_id}>"
\ No newline at end of file
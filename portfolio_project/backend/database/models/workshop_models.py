@@ -1,8 +1,10 @@
 """
 Workshop-related SQLAlchemy Models
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, Numeric
+from datetime import datetime
+from sqlalchemy import CheckConstraint, Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, Numeric, text
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
 from database.config import Base
 
@@ -10,7 +12,7 @@ class Workshop(Base):
     """Workshop model"""
     __tablename__ = 'portfolio_app_workshop'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     title = Column(String(255), nullable=False)
     slug = Column(String(255), unique=True, nullable=False)
     description = Column(Text, nullable=False)
@@ -59,22 +61,38 @@ class Workshop(Base):
         Index('idx_workshop_start_date', 'start_date'),
         Index('idx_workshop_status', 'status'),
         Index('idx_workshop_featured', 'is_featured'),
-        Index('idx_workshop_paid', 'is_paid'),
-        Index('idx_workshop_active', 'is_active'),
+        # Active listings sort on start_date; upcoming ones also filter on status
+        Index('idx_workshop_active_start', 'is_active', 'start_date'),
+        Index('idx_workshop_active_status_start', 'is_active', 'status', 'start_date'),
+        # Paid/free listings only show active workshops: partial on PostgreSQL
+        Index(
+            'idx_workshop_paid_active_start', 'is_paid', 'is_active', 'start_date',
+            postgresql_where=text('is_active')
+        ),
+        # Last-resort guard; try_register() is what keeps signups within capacity
+        CheckConstraint('registered_count <= max_participants', name='ck_workshop_capacity'),
     )
     
-    @property
+    @hybrid_property
     def is_upcoming(self):
-        return self.start_date > func.now()
+        return self.start_date > datetime.now()
     
-    @property
+    @is_upcoming.expression
+    def is_upcoming(cls):
+        return cls.start_date > func.now()
+    
+    @hybrid_property
     def is_full(self):
         return self.registered_count >= self.max_participants
     
-    @property
+    @hybrid_property
     def spots_remaining(self):
         return max(0, self.max_participants - self.registered_count)
     
+    @spots_remaining.expression
+    def spots_remaining(cls):
+        return func.greatest(0, cls.max_participants - cls.registered_count)
+    
     def __repr__(self):
         return f"<Workshop {self.title}>"
 
@@ -82,7 +100,7 @@ class WorkshopApplication(Base):
     """Workshop application model"""
     __tablename__ = 'portfolio_app_workshopapplication'
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     workshop_id = Column(Integer, ForeignKey('portfolio_app_workshop.id'), nullable=False)
     name = Column(String(100), nullable=False)
     email = Column(String(254), nullable=False)
@@ -104,15 +122,15 @@ class WorkshopApplication(Base):
     notes = Column(Text, nullable=True)
     
     # Relationships
-    workshop = relationship("Workshop", back_populates="applications")
+    workshop = relationship("Workshop", back_populates="applications", lazy="selectin")
     
     __table_args__ = (
-        Index('idx_application_workshop', 'workshop_id'),
         Index('idx_application_status', 'status'),
         Index('idx_application_payment_status', 'payment_status'),
-        Index('idx_application_email', 'email'),
         Index('idx_application_applied_at', 'applied_at'),
+        Index('idx_application_workshop_email_lower', 'workshop_id', func.lower(email)),
+        Index('idx_application_workshop_applied', 'workshop_id', 'applied_at'),
     )
     
     def __repr__(self):
-        return f"<WorkshopApplication {self.name} - {self.workshop.title if self.workshop else 'Unknown'}>"
\ No newline at end of file
+        return f"<WorkshopApplication {self.name} - workshop {self.workshop_id}>"
\ No newline at end of file
@@ -1,46 +1,197 @@
 """
 Base Service Class for Database Operations
 """
-from sqlalchemy.orm import Session
-from database.config import SessionLocal
-from typing import Type, TypeVar, Generic, List, Optional
+from cachetools import TTLCache
+from contextlib import contextmanager
+from sqlalchemy import event, exists, func, insert, inspect, select, tuple_
+from sqlalchemy.orm import Session, noload, object_session, raiseload
+from database.config import ScopedSession
+from typing import Type, TypeVar, Generic, Iterator, List, Optional, Tuple
 from sqlalchemy.exc import SQLAlchemyError
 import logging
+import os
+import threading
 
 logger = logging.getLogger(__name__)
 
 ModelType = TypeVar("ModelType")
 
+# SQLALCHEMY_STRICT_LOADING=1 makes a lazy load a list query didn't plan for raise instead of querying
+STRICT_LOADING = os.getenv('SQLALCHEMY_STRICT_LOADING', '0') == '1'
+
+LIST_CACHE_TTL = int(os.getenv('LIST_CACHE_TTL', '60'))
+LIST_CACHE_SIZE = int(os.getenv('LIST_CACHE_SIZE', '256'))
+# Process-local caches of small, hot, rarely-changing lists, one bounded TTLCache per TTL:
+# {ttl: TTLCache({(model, bind, key): rows})}
+_list_caches = {}
+_list_cache_lock = threading.Lock()
+
+def _list_cache(ttl: int) -> TTLCache:
+    with _list_cache_lock:
+        if ttl not in _list_caches:
+            _list_caches[ttl] = TTLCache(maxsize=LIST_CACHE_SIZE, ttl=ttl)
+        return _list_caches[ttl]
+
+def invalidate_list_cache(model) -> None:
+    """Drop every cached list of model"""
+    with _list_cache_lock:
+        for cache in _list_caches.values():
+            for key in [key for key in cache if key[0] is model]:
+                cache.pop(key, None)
+
+def invalidate_list_cache_on_commit(session, model) -> None:
+    """Drop every cached list of model once session's transaction commits"""
+    # Dropping them earlier lets a concurrent cache miss re-cache the pre-commit rows for a full TTL
+    session.info.setdefault('invalidate_lists', set()).add(model)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed_lists(session):
+    for model in session.info.pop('invalidate_lists', ()):
+        invalidate_list_cache(model)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_rolled_back_invalidations(session):
+    session.info.pop('invalidate_lists', None)
+
+def _on_cached_model_write(mapper, connection, target):
+    invalidate_list_cache_on_commit(object_session(target), mapper.class_)
+
+def invalidate_lists_on_write(*models) -> None:
+    """Clear a model's cached lists whenever a row is written through SQLAlchemy"""
+    # Writes made through Django don't fire these; they show up once the TTL runs out
+    for model in models:
+        for name in ('after_insert', 'after_update', 'after_delete'):
+            if not event.contains(model, name, _on_cached_model_write):
+                event.listen(model, name, _on_cached_model_write)
+
 class BaseService(Generic[ModelType]):
     """Base service class with common CRUD operations"""
     
-    def __init__(self, model: Type[ModelType]):
+    def __init__(self, model: Type[ModelType], session: Optional[Session] = None):
         self.model = model
-        self.db = SessionLocal()
+        # Share the request's session unless the caller supplies its own. The service owns
+        # neither: SQLAlchemyMiddleware removes the registry, and callers close theirs
+        self.db = session if session is not None else ScopedSession
+    
+    @contextmanager
+    def transaction(self):
+        """Run several service writes as one unit of work with a single commit"""
+        # Tracked on the session, so writes through other services sharing it join in too
+        if self.db.info.get('in_service_transaction'):
+            yield self
+            return
+        self.db.info['in_service_transaction'] = True
+        try:
+            yield self
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            self.db.info.pop('in_service_transaction', None)
+    
+    def _commit(self):
+        """Commit, or only flush when inside transaction() so the batch commits once"""
+        if self.db.info.get('in_service_transaction'):
+            self.db.flush()
+        else:
+            self.db.commit()
+    
+    def _cached_list(self, model, key: tuple, stmt, ttl: int = LIST_CACHE_TTL) -> list:
+        """Run stmt through the process-local list cache, returning instances in this session"""
+        # This session's own pending or uncommitted writes must be seen here, and never shared
+        if self.db.info.get('in_service_transaction') or self.db.new or self.db.dirty or self.db.deleted:
+            return self.db.scalars(stmt).all()
+        # Keyed by bind, so services on another engine or connection never share entries
+        bind = self.db.get_bind()
+        cache = _list_cache(ttl)
+        cache_key = (model, bind, key)
+        with _list_cache_lock:
+            rows = cache.get(cache_key)
+        if rows is None:
+            # A private session on the same bind leaves the cached instances detached with every column loaded
+            with Session(bind=bind, expire_on_commit=False) as session:
+                rows = session.scalars(stmt).all()
+            with _list_cache_lock:
+                cache[cache_key] = rows
+        # merge(load=False) attaches copies to this session without a query
+        return [self.db.merge(obj, load=False) for obj in rows]
+    
+    def _list_options(self, entity, *eager) -> list:
+        """Loader options for a list query of entity: the given eager loads, plus raiseloads in strict mode"""
+        if not STRICT_LOADING:
+            return list(eager)
+        # Only the plain lazy relationships: raiseload('*') would also replace the mapped
+        # selectin/joined loads. sql_only lets identity-map hits through; eager comes last so it wins
+        raises = [
+            raiseload(relationship.class_attribute, sql_only=True)
+            for relationship in inspect(entity).relationships if relationship.lazy in ('select', True)
+        ]
+        return [*raises, *eager]
+    
+    def _seek_page(self, query, sort_column, cursor: Optional[tuple], limit: int,
+                   descending: bool = True) -> Tuple[list, Optional[tuple]]:
+        """Keyset page of query ordered by (sort_column, id); returns (rows, next_cursor)"""
+        # Seeking past the cursor is an index range scan, so deep pages cost the same as the first
+        id_column = sort_column.class_.id
+        key = tuple_(sort_column, id_column)
+        if cursor is not None:
+            query = query.filter(key < tuple_(*cursor) if descending else key > tuple_(*cursor))
+        if descending:
+            query = query.order_by(sort_column.desc(), id_column.desc())
+        else:
+            query = query.order_by(sort_column.asc(), id_column.asc())
+        rows = query.limit(limit).all()
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = (getattr(rows[-1], sort_column.key), rows[-1].id)
+        return rows, next_cursor
     
     def __enter__(self):
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.db.close()
+        # Closing here would detach what earlier services in the request loaded
+        pass
     
     def create(self, **kwargs) -> ModelType:
         """Create a new record"""
         try:
             db_obj = self.model(**kwargs)
             self.db.add(db_obj)
-            self.db.commit()
-            self.db.refresh(db_obj)
+            self._commit()
+            # No refresh(): only server-generated columns load, and only if the caller reads them
             return db_obj
         except SQLAlchemyError as e:
             self.db.rollback()
             logger.error(f"Error creating {self.model.__name__}: {e}")
             raise
     
+    def bulk_create(self, rows: List[dict], page_size: int = 1000) -> int:
+        """Create many records from column dicts in multi-row INSERTs; returns the row count"""
+        try:
+            count = self._insert_many(self.model, rows, page_size)
+            self._commit()
+            return count
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Error bulk creating {self.model.__name__}: {e}")
+            raise
+    
+    def _insert_many(self, model, rows: List[dict], page_size: int = 1000) -> int:
+        """Executemany INSERT of rows (no ORM objects, no per-row refresh); doesn't commit"""
+        if not rows:
+            return 0
+        self.db.execute(
+            insert(model).execution_options(insertmanyvalues_page_size=page_size), rows
+        )
+        return len(rows)
+    
     def get(self, id: int) -> Optional[ModelType]:
         """Get a record by ID"""
         try:
-            return self.db.query(self.model).filter(self.model.id == id).first()
+            # Served from the identity map without SQL when already loaded in this session
+            return self.db.get(self.model, id)
         except SQLAlchemyError as e:
             logger.error(f"Error getting {self.model.__name__} with id {id}: {e}")
             raise
@@ -53,6 +204,33 @@ class BaseService(Generic[ModelType]):
             logger.error(f"Error getting all {self.model.__name__}: {e}")
             raise
     
+    def iter_all(self, batch_size: int = 1000) -> Iterator[ModelType]:
+        """Stream every record in id order, batch_size rows at a time (relationships left unloaded)"""
+        try:
+            # Mapped selectin loads would query the connection the open cursor is still reading
+            yield from self._stream(
+                select(self.model).options(noload('*')).order_by(self.model.id), batch_size
+            )
+        except SQLAlchemyError as e:
+            logger.error(f"Error streaming {self.model.__name__}: {e}")
+            raise
+    
+    def _stream(self, stmt, batch_size: int = 1000) -> Iterator:
+        """Execute stmt on a server-side cursor and yield its entities batch_size rows at a time
+
+        The cursor holds the session's connection until the stream is exhausted; a caller
+        that stops early must close() the generator before using the session again.
+        """
+        # Memory stays at one batch instead of the whole result
+        result = self.db.execute(
+            stmt.execution_options(stream_results=True, yield_per=batch_size)
+        )
+        try:
+            yield from result.scalars()
+        finally:
+            # Runs on exhaustion and on close(), releasing the server-side cursor
+            result.close()
+    
     def update(self, id: int, **kwargs) -> Optional[ModelType]:
         """Update a record by ID"""
         try:
@@ -61,7 +239,7 @@ class BaseService(Generic[ModelType]):
                 for key, value in kwargs.items():
                     if hasattr(db_obj, key):
                         setattr(db_obj, key, value)
-                self.db.commit()
+                self._commit()
                 self.db.refresh(db_obj)
             return db_obj
         except SQLAlchemyError as e:
@@ -75,7 +253,7 @@ class BaseService(Generic[ModelType]):
             db_obj = self.get(id)
             if db_obj:
                 self.db.delete(db_obj)
-                self.db.commit()
+                self._commit()
                 return True
             return False
         except SQLAlchemyError as e:
@@ -86,7 +264,8 @@ class BaseService(Generic[ModelType]):
     def count(self) -> int:
         """Count total records"""
         try:
-            return self.db.query(self.model).count()
+            # COUNT(*) on the table itself, not over a wrapped entity subquery
+            return self.db.scalar(select(func.count()).select_from(self.model))
         except SQLAlchemyError as e:
             logger.error(f"Error counting {self.model.__name__}: {e}")
             raise
@@ -94,7 +273,16 @@ class BaseService(Generic[ModelType]):
     def exists(self, id: int) -> bool:
         """Check if record exists"""
         try:
-            return self.db.query(self.model).filter(self.model.id == id).first() is not None
+            # SELECT EXISTS(...) returns one boolean; no columns fetched, no object built
+            return bool(self.db.scalar(select(exists().where(self.model.id == id))))
         except SQLAlchemyError as e:
             logger.error(f"Error checking existence of {self.model.__name__} with id {id}: {e}")
+            raise
+    
+    def has_any(self) -> bool:
+        """Check if any record exists (cheaper than count() > 0)"""
+        try:
+            return bool(self.db.scalar(select(exists().select_from(self.model))))
+        except SQLAlchemyError as e:
+            logger.error(f"Error checking for any {self.model.__name__}: {e}")
             raise
\ No newline at end of file
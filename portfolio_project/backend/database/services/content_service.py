@@ -1,40 +1,97 @@
 """
 Content Service for Database Operations
 """
-from sqlalchemy.orm import joinedload
+from sqlalchemy import Integer, Row, bindparam, inspect, select, update
+from sqlalchemy.orm import Session, contains_eager, joinedload, selectinload, undefer
 from sqlalchemy.sql import func
 from database.models.content_models import BlogPost, BlogCategory, BlogTag, Newsletter, Subscriber
-from .base_service import BaseService
+from .base_service import BaseService, invalidate_lists_on_write
 from typing import Optional, List
 import logging
+import os
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# BlogPost relationships are lazy='raise'; list queries load them in one extra SELECT each
+_POST_RELATIONS = (
+    selectinload(BlogPost.author),
+    selectinload(BlogPost.category),
+    selectinload(BlogPost.tags),
+)
+
+# Hot lookups are built once at import; per-request values travel as bind
+# parameters so each call skips statement construction and reuses the compiled SQL
+PUBLISHED_POSTS = select(BlogPost).options(*_POST_RELATIONS).where(
+    BlogPost.status == 'published'
+).order_by(BlogPost.publish_date.desc()).offset(
+    bindparam('skip', type_=Integer)
+).limit(bindparam('limit', type_=Integer))
+
+PUBLISHED_POST_SUMMARIES = select(
+    BlogPost.id, BlogPost.slug, BlogPost.title, BlogPost.excerpt,
+    BlogPost.publish_date, BlogPost.views_count
+).where(
+    BlogPost.status == 'published'
+).order_by(BlogPost.publish_date.desc()).offset(
+    bindparam('skip', type_=Integer)
+).limit(bindparam('limit', type_=Integer))
+
+POST_BY_SLUG = select(BlogPost).options(
+    undefer(BlogPost.content),
+    joinedload(BlogPost.category),
+    # A joined collection would multiply the post row per tag
+    selectinload(BlogPost.tags),
+    joinedload(BlogPost.author)
+).where(BlogPost.slug == bindparam('slug')).limit(1)
+
+SUBSCRIBER_BY_EMAIL = select(Subscriber).where(
+    func.lower(Subscriber.email) == func.lower(bindparam('email'))
+).limit(1)
+
+# Categories and tags render on every page but change rarely
+TAXONOMY_CACHE_TTL = int(os.getenv('TAXONOMY_CACHE_TTL', '300'))
+invalidate_lists_on_write(BlogCategory, BlogTag)
+
 class ContentService(BaseService[BlogPost]):
     """Service for content-related database operations"""
     
-    def __init__(self):
-        super().__init__(BlogPost)
+    def __init__(self, session: Optional[Session] = None):
+        super().__init__(BlogPost, session)
+    
+    def _cached_lookup(self, key: tuple, load):
+        """Memoize a unique-key lookup on the session, i.e. for the rest of the request"""
+        cache = self.db.info.setdefault('content_lookups', {})
+        obj = cache.get(key)
+        # Reload once the instance has left the session or been expired by a commit
+        if obj is None or obj not in self.db or inspect(obj).expired_attributes:
+            obj = load()
+            cache[key] = obj
+        return obj
     
     def get_published_posts(self, skip: int = 0, limit: int = 10) -> List[BlogPost]:
         """Get published blog posts"""
         try:
-            return self.db.query(BlogPost).filter(
-                BlogPost.status == 'published'
-            ).order_by(BlogPost.publish_date.desc()).offset(skip).limit(limit).all()
+            return self.db.execute(PUBLISHED_POSTS, {'skip': skip, 'limit': limit}).scalars().all()
         except Exception as e:
             logger.error(f"Error getting published posts: {e}")
             raise
     
+    def list_published_posts_summary(self, skip: int = 0, limit: int = 10) -> List[Row]:
+        """Get (id, slug, title, excerpt, publish_date, views_count) rows for published posts"""
+        try:
+            return self.db.execute(PUBLISHED_POST_SUMMARIES, {'skip': skip, 'limit': limit}).all()
+        except Exception as e:
+            logger.error(f"Error getting published post summaries: {e}")
+            raise
+    
     def get_post_by_slug(self, slug: str) -> Optional[BlogPost]:
         """Get blog post by slug"""
         try:
-            return self.db.query(BlogPost).options(
-                joinedload(BlogPost.category),
-                joinedload(BlogPost.tags),
-                joinedload(BlogPost.author)
-            ).filter(BlogPost.slug == slug).first()
+            return self._cached_lookup(
+                ('post', slug),
+                lambda: self.db.execute(POST_BY_SLUG, {'slug': slug}).scalars().first()
+            )
         except Exception as e:
             logger.error(f"Error getting post by slug {slug}: {e}")
             raise
@@ -42,7 +99,7 @@ class ContentService(BaseService[BlogPost]):
     def get_featured_posts(self, limit: int = 5) -> List[BlogPost]:
         """Get featured blog posts"""
         try:
-            return self.db.query(BlogPost).filter(
+            return self.db.query(BlogPost).options(*_POST_RELATIONS).filter(
                 BlogPost.is_featured == True,
                 BlogPost.status == 'published'
             ).order_by(BlogPost.publish_date.desc()).limit(limit).all()
@@ -53,7 +110,12 @@ class ContentService(BaseService[BlogPost]):
     def get_posts_by_category(self, category_slug: str, skip: int = 0, limit: int = 10) -> List[BlogPost]:
         """Get posts by category"""
         try:
-            return self.db.query(BlogPost).join(BlogCategory).filter(
+            # The category is already joined for the filter, so fill it from that join
+            return self.db.query(BlogPost).join(BlogPost.category).options(
+                contains_eager(BlogPost.category),
+                selectinload(BlogPost.author),
+                selectinload(BlogPost.tags)
+            ).filter(
                 BlogCategory.slug == category_slug,
                 BlogPost.status == 'published'
             ).order_by(BlogPost.publish_date.desc()).offset(skip).limit(limit).all()
@@ -64,12 +126,14 @@ class ContentService(BaseService[BlogPost]):
     def increment_views(self, post_id: int) -> bool:
         """Increment post views"""
         try:
-            post = self.get(post_id)
-            if post:
-                post.views_count += 1
-                self.db.commit()
-                return True
-            return False
+            # Atomic in the database: no SELECT, no lost increments under concurrent views
+            result = self.db.execute(
+                update(BlogPost).where(BlogPost.id == post_id).values(
+                    views_count=BlogPost.views_count + 1
+                )
+            )
+            self._commit()
+            return result.rowcount > 0
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error incrementing views for post {post_id}: {e}")
@@ -79,7 +143,10 @@ class ContentService(BaseService[BlogPost]):
     def get_categories(self) -> List[BlogCategory]:
         """Get all blog categories"""
         try:
-            return self.db.query(BlogCategory).order_by(BlogCategory.name).all()
+            return self._cached_list(
+                BlogCategory, ('all',), select(BlogCategory).order_by(BlogCategory.name),
+                TAXONOMY_CACHE_TTL
+            )
         except Exception as e:
             logger.error(f"Error getting categories: {e}")
             raise
@@ -87,7 +154,10 @@ class ContentService(BaseService[BlogPost]):
     def get_category_by_slug(self, slug: str) -> Optional[BlogCategory]:
         """Get category by slug"""
         try:
-            return self.db.query(BlogCategory).filter(BlogCategory.slug == slug).first()
+            return self._cached_lookup(
+                ('category', slug),
+                lambda: self.db.query(BlogCategory).filter(BlogCategory.slug == slug).first()
+            )
         except Exception as e:
             logger.error(f"Error getting category by slug {slug}: {e}")
             raise
@@ -96,7 +166,9 @@ class ContentService(BaseService[BlogPost]):
     def get_tags(self) -> List[BlogTag]:
         """Get all blog tags"""
         try:
-            return self.db.query(BlogTag).order_by(BlogTag.name).all()
+            return self._cached_list(
+                BlogTag, ('all',), select(BlogTag).order_by(BlogTag.name), TAXONOMY_CACHE_TTL
+            )
         except Exception as e:
             logger.error(f"Error getting tags: {e}")
             raise
@@ -111,18 +183,41 @@ class ContentService(BaseService[BlogPost]):
                 confirmation_token=token or str(uuid.uuid4())
             )
             self.db.add(subscriber)
-            self.db.commit()
-            self.db.refresh(subscriber)
+            self._commit()
             return subscriber
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error creating subscriber {email}: {e}")
             raise
     
+    def bulk_create_subscribers(self, emails: List[str]) -> int:
+        """Subscribe many addresses at once, skipping ones already subscribed"""
+        try:
+            # Emails match case-insensitively: keep the first spelling of each address
+            unique = {}
+            for email in emails:
+                unique.setdefault(email.lower(), email)
+            existing = set(self.db.scalars(
+                select(func.lower(Subscriber.email)).where(func.lower(Subscriber.email).in_(list(unique)))
+            )) if unique else set()
+            count = self._insert_many(Subscriber, [
+                {'email': email, 'confirmation_token': str(uuid.uuid4())}
+                for key, email in unique.items() if key not in existing
+            ])
+            self._commit()
+            return count
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error bulk creating subscribers: {e}")
+            raise
+    
     def get_subscriber_by_email(self, email: str) -> Optional[Subscriber]:
         """Get subscriber by email"""
         try:
-            return self.db.query(Subscriber).filter(Subscriber.email == email).first()
+            return self._cached_lookup(
+                ('subscriber', email.lower()),
+                lambda: self.db.execute(SUBSCRIBER_BY_EMAIL, {'email': email}).scalars().first()
+            )
         except Exception as e:
             logger.error(f"Error getting subscriber by email {email}: {e}")
             raise
@@ -137,7 +232,7 @@ class ContentService(BaseService[BlogPost]):
             if subscriber:
                 subscriber.is_confirmed = True
                 subscriber.confirmed_at = func.now()
-                self.db.commit()
+                self._commit()
                 return True
             return False
         except Exception as e:
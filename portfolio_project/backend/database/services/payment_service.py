@@ -1,23 +1,32 @@
 """
 Payment Service for Database Operations
 """
-from sqlalchemy.orm import joinedload
-from sqlalchemy import and_
+from sqlalchemy import Row, bindparam, insert, select, update
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.sql import func
+from database.config import SessionLocal
 from database.models.payment_models import Payment, PurchasedCourse
 from database.models.contact_models import ContactMessage
+from database.models.user_models import User
 from .base_service import BaseService
-from typing import Optional, List
-from datetime import datetime
+from typing import Optional, List, Tuple
+import atexit
 import logging
+import os
+import queue
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Webhook verification looks payments up by gateway-facing id; built once, bound per call
+PAYMENT_BY_ID = select(Payment).where(Payment.payment_id == bindparam('payment_id')).limit(1)
+
 class PaymentService(BaseService[Payment]):
     """Service for payment-related database operations"""
     
-    def __init__(self):
-        super().__init__(Payment)
+    def __init__(self, session: Optional[Session] = None):
+        super().__init__(Payment, session)
     
     def create_payment(self, payment_id: str, amount: float, payment_type: str, **payment_data) -> Payment:
         """Create a new payment record"""
@@ -29,8 +38,7 @@ class PaymentService(BaseService[Payment]):
                 **payment_data
             )
             self.db.add(payment)
-            self.db.commit()
-            self.db.refresh(payment)
+            self._commit()
             return payment
         except Exception as e:
             self.db.rollback()
@@ -40,7 +48,7 @@ class PaymentService(BaseService[Payment]):
     def get_payment_by_id(self, payment_id: str) -> Optional[Payment]:
         """Get payment by payment ID"""
         try:
-            return self.db.query(Payment).filter(Payment.payment_id == payment_id).first()
+            return self.db.execute(PAYMENT_BY_ID, {'payment_id': payment_id}).scalars().first()
         except Exception as e:
             logger.error(f"Error getting payment by ID {payment_id}: {e}")
             raise
@@ -48,37 +56,68 @@ class PaymentService(BaseService[Payment]):
     def get_payments_by_email(self, email: str) -> List[Payment]:
         """Get payments by customer email"""
         try:
-            return self.db.query(Payment).filter(
-                Payment.customer_email == email
+            return self.db.query(Payment).options(*self._list_options(Payment)).filter(
+                func.lower(Payment.customer_email) == func.lower(email)
             ).order_by(Payment.created_at.desc()).all()
         except Exception as e:
             logger.error(f"Error getting payments for email {email}: {e}")
             raise
     
+    def get_payment_history_by_email(self, email: str) -> List[Row]:
+        """Get (payment_id, amount, status, payment_type, created_at) rows for a customer, newest first"""
+        try:
+            # Index-only scan on PostgreSQL (INCLUDE columns); on TiDB the index finds the rows by email
+            return self.db.execute(
+                select(
+                    Payment.payment_id, Payment.amount, Payment.status,
+                    Payment.payment_type, Payment.created_at
+                ).where(
+                    func.lower(Payment.customer_email) == func.lower(email)
+                ).order_by(Payment.created_at.desc())
+            ).all()
+        except Exception as e:
+            logger.error(f"Error getting payment history for email {email}: {e}")
+            raise
+    
     def get_payments_by_type(self, payment_type: str, skip: int = 0, limit: int = 10) -> List[Payment]:
         """Get payments by type"""
         try:
-            return self.db.query(Payment).filter(
+            return self.db.query(Payment).options(*self._list_options(Payment)).filter(
                 Payment.payment_type == payment_type
             ).order_by(Payment.created_at.desc()).offset(skip).limit(limit).all()
         except Exception as e:
             logger.error(f"Error getting payments by type {payment_type}: {e}")
             raise
     
+    def get_payments_by_type_page(self, payment_type: str, cursor: Optional[tuple] = None,
+                                  limit: int = 10) -> Tuple[List[Payment], Optional[tuple]]:
+        """Get a keyset page of payments by type, newest first; pass back next_cursor for the next page"""
+        try:
+            return self._seek_page(
+                self.db.query(Payment).options(*self._list_options(Payment)).filter(Payment.payment_type == payment_type),
+                Payment.created_at, cursor, limit
+            )
+        except Exception as e:
+            logger.error(f"Error getting payments by type {payment_type}: {e}")
+            raise
+    
     def mark_payment_completed(self, payment_id: str, gateway_payment_id: str, payment_method: str, gateway_response: dict = None) -> bool:
         """Mark payment as completed"""
         try:
-            payment = self.get_payment_by_id(payment_id)
-            if payment:
-                payment.status = 'completed'
-                payment.gateway_payment_id = gateway_payment_id
-                payment.payment_method = payment_method
-                payment.completed_at = datetime.now()
-                if gateway_response:
-                    payment.gateway_response = gateway_response
-                self.db.commit()
-                return True
-            return False
+            values = {
+                'status': 'completed',
+                'gateway_payment_id': gateway_payment_id,
+                'payment_method': payment_method,
+                'completed_at': func.now()
+            }
+            if gateway_response:
+                values['gateway_response'] = gateway_response
+            # One UPDATE instead of SELECT-then-UPDATE; rowcount says whether the payment exists
+            result = self.db.execute(
+                update(Payment).where(Payment.payment_id == payment_id).values(**values)
+            )
+            self._commit()
+            return result.rowcount > 0
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error marking payment {payment_id} as completed: {e}")
@@ -87,14 +126,17 @@ class PaymentService(BaseService[Payment]):
     def mark_payment_failed(self, payment_id: str, reason: str = None) -> bool:
         """Mark payment as failed"""
         try:
-            payment = self.get_payment_by_id(payment_id)
-            if payment:
-                payment.status = 'failed'
-                if reason and payment.gateway_response:
-                    payment.gateway_response['failure_reason'] = reason
-                self.db.commit()
-                return True
-            return False
+            values = {'status': 'failed'}
+            if reason:
+                # Merged into gateway_response by the same UPDATE, keeping whatever the gateway sent
+                values['gateway_response'] = func.json_set(
+                    func.coalesce(Payment.gateway_response, '{}'), '$.failure_reason', reason
+                )
+            result = self.db.execute(
+                update(Payment).where(Payment.payment_id == payment_id).values(**values)
+            )
+            self._commit()
+            return result.rowcount > 0
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error marking payment {payment_id} as failed: {e}")
@@ -112,18 +154,28 @@ class PaymentService(BaseService[Payment]):
                 **course_data
             )
             self.db.add(course)
-            self.db.commit()
-            self.db.refresh(course)
+            self._commit()
             return course
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error creating purchased course: {e}")
             raise
     
+    def create_purchased_courses_bulk(self, rows: List[dict]) -> int:
+        """Create many purchased course records in multi-row INSERTs; returns the row count"""
+        try:
+            count = self._insert_many(PurchasedCourse, rows)
+            self._commit()
+            return count
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error bulk creating purchased courses: {e}")
+            raise
+    
     def get_user_courses(self, user_id: int) -> List[PurchasedCourse]:
         """Get user's purchased courses"""
         try:
-            return self.db.query(PurchasedCourse).filter(
+            return self.db.query(PurchasedCourse).options(*self._list_options(PurchasedCourse)).filter(
                 PurchasedCourse.user_id == user_id
             ).order_by(PurchasedCourse.purchase_date.desc()).all()
         except Exception as e:
@@ -133,11 +185,10 @@ class PaymentService(BaseService[Payment]):
     def get_active_courses(self, user_id: int) -> List[PurchasedCourse]:
         """Get user's active courses"""
         try:
-            return self.db.query(PurchasedCourse).filter(
-                and_(
-                    PurchasedCourse.user_id == user_id,
-                    PurchasedCourse.status == 'active'
-                )
+            # Expired courses are filtered in SQL, not after loading
+            return self.db.query(PurchasedCourse).options(*self._list_options(PurchasedCourse)).filter(
+                PurchasedCourse.user_id == user_id,
+                PurchasedCourse.is_active
             ).order_by(PurchasedCourse.purchase_date.desc()).all()
         except Exception as e:
             logger.error(f"Error getting active courses for user {user_id}: {e}")
@@ -146,67 +197,211 @@ class PaymentService(BaseService[Payment]):
     def mark_course_accessed(self, course_id: int) -> bool:
         """Mark course as accessed"""
         try:
-            course = self.db.query(PurchasedCourse).filter(
-                PurchasedCourse.id == course_id
-            ).first()
-            
-            if course:
-                course.last_accessed = datetime.now()
-                self.db.commit()
-                return True
-            return False
+            result = self.db.execute(
+                update(PurchasedCourse).where(PurchasedCourse.id == course_id).values(
+                    last_accessed=func.now()
+                )
+            )
+            self._commit()
+            return result.rowcount > 0
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error marking course {course_id} as accessed: {e}")
             raise
     
     # Contact Message operations
-    def create_contact_message(self, name: str, email: str, subject: str, message: str, **message_data) -> ContactMessage:
-        """Create contact message"""
-        try:
-            contact = ContactMessage(
-                name=name,
-                email=email,
-                subject=subject,
-                message=message,
-                **message_data
+    def create_contact_message(self, name: str, email: str, subject: str, message: str, **message_data) -> None:
+        """Queue a contact message; the background writer commits it in a batch within `interval` seconds"""
+        try:
+            contact_message_writer.put(
+                dict(name=name, email=email, subject=subject, message=message, **message_data)
             )
-            self.db.add(contact)
-            self.db.commit()
-            self.db.refresh(contact)
-            return contact
         except Exception as e:
-            self.db.rollback()
-            logger.error(f"Error creating contact message: {e}")
+            logger.error(f"Error queueing contact message: {e}")
             raise
     
-    def get_contact_messages(self, status: str = None, skip: int = 0, limit: int = 10) -> List[ContactMessage]:
+    def _contact_messages_query(self, status: str = None, with_assignee: bool = False):
+        """Contact messages, optionally filtered by status and with assignees batch-loaded"""
+        eager = []
+        if with_assignee:
+            # One IN query for the page's assignees, and only the columns the inbox shows
+            assignee = selectinload(ContactMessage.assigned_to)
+            eager = [
+                assignee.load_only(User.id, User.username),
+                # User.profile is mapped lazy='joined'; the inbox doesn't need it
+                assignee.lazyload(User.profile)
+            ]
+        query = self.db.query(ContactMessage).options(*self._list_options(ContactMessage, *eager))
+        if status:
+            query = query.filter(ContactMessage.status == status)
+        return query
+    
+    def get_contact_messages(self, status: str = None, skip: int = 0, limit: int = 10,
+                             with_assignee: bool = False) -> List[ContactMessage]:
         """Get contact messages"""
         try:
-            query = self.db.query(ContactMessage)
-            if status:
-                query = query.filter(ContactMessage.status == status)
+            query = self._contact_messages_query(status, with_assignee)
             return query.order_by(ContactMessage.created_at.desc()).offset(skip).limit(limit).all()
         except Exception as e:
             logger.error(f"Error getting contact messages: {e}")
             raise
     
+    def get_contact_messages_page(self, status: str = None, cursor: Optional[tuple] = None, limit: int = 10,
+                                  with_assignee: bool = False) -> Tuple[List[ContactMessage], Optional[tuple]]:
+        """Get a keyset page of contact messages, newest first; pass back next_cursor for the next page"""
+        try:
+            query = self._contact_messages_query(status, with_assignee)
+            return self._seek_page(query, ContactMessage.created_at, cursor, limit)
+        except Exception as e:
+            logger.error(f"Error getting contact messages: {e}")
+            raise
+    
     def mark_message_read(self, message_id: int, user_id: int = None) -> bool:
         """Mark contact message as read"""
         try:
-            message = self.db.query(ContactMessage).filter(
-                ContactMessage.id == message_id
-            ).first()
-            
-            if message and message.status == 'new':
-                message.status = 'read'
-                message.read_at = datetime.now()
-                if user_id:
-                    message.assigned_to_id = user_id
-                self.db.commit()
-                return True
-            return False
+            values = {'status': 'read', 'read_at': func.now()}
+            if user_id:
+                values['assigned_to_id'] = user_id
+            # The status guard lives in the WHERE, so a message can only leave 'new' once
+            result = self.db.execute(
+                update(ContactMessage).where(
+                    ContactMessage.id == message_id,
+                    ContactMessage.status == 'new'
+                ).values(**values)
+            )
+            self._commit()
+            return result.rowcount > 0
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error marking message {message_id} as read: {e}")
-            raise
\ No newline at end of file
+            raise
+
+
+class ContactMessageWriter:
+    """Buffer contact messages and INSERT them in batches from a background thread"""
+    
+    # Queued by shutdown(); the worker writes what it holds and exits when it takes this
+    _STOP = object()
+    
+    # Columns a queued row may set; the database computes the rest
+    _COLUMNS = frozenset(column.key for column in ContactMessage.__table__.c if column.computed is None)
+    
+    def __init__(self, batch_size: int = 50, interval: float = 0.2, retries: int = 3,
+                 session_factory=SessionLocal):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.retries = retries
+        self.session_factory = session_factory
+        self._queue = queue.Queue()
+        self._start_lock = threading.Lock()
+        # Held while a batch is written, so flush() waits for the one in flight
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._stopped = False
+        self._atexit_registered = False
+    
+    def put(self, row: dict) -> None:
+        """Queue one contact message row; it is written within `interval` seconds"""
+        # executemany would silently drop keys that aren't columns, so reject them up front
+        unknown = set(row) - self._COLUMNS
+        if unknown:
+            raise TypeError(f"Unknown contact message fields: {', '.join(sorted(unknown))}")
+        if self._stopped:
+            # Past shutdown there is no worker to hand the row to
+            with self._write_lock:
+                self._write([row])
+            return
+        self._ensure_started()
+        self._queue.put(row)
+    
+    def flush(self) -> None:
+        """Write everything still queued"""
+        with self._write_lock:
+            while True:
+                batch = self._take(self.batch_size, wait=False)
+                if not batch:
+                    return
+                self._write(batch)
+    
+    def shutdown(self) -> None:
+        """Stop the worker once it has written its batch, then write anything left (runs at exit)"""
+        self._stopped = True
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+        self.flush()
+    
+    def _ensure_started(self):
+        # Also restarts a worker that died, so queued rows are never stranded
+        if self._thread is None or not self._thread.is_alive():
+            with self._start_lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(
+                        target=self._run, name='contact-message-writer', daemon=True
+                    )
+                    self._thread.start()
+                    if not self._atexit_registered:
+                        atexit.register(self.shutdown)
+                        self._atexit_registered = True
+    
+    def _run(self):
+        while True:
+            # Block for the first message, then give the batch `interval` seconds to fill
+            first = self._queue.get()
+            batch = [] if first is self._STOP else [first] + self._take(self.batch_size - 1, wait=True)
+            stopping = first is self._STOP or self._STOP in batch
+            batch = [row for row in batch if row is not self._STOP]
+            if batch:
+                with self._write_lock:
+                    self._write(batch)
+            if stopping:
+                return
+    
+    def _take(self, limit: int, wait: bool) -> List[dict]:
+        batch = []
+        deadline = time.monotonic() + self.interval
+        while len(batch) < limit:
+            try:
+                if wait:
+                    row = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                else:
+                    row = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(row)
+            if row is self._STOP:
+                break
+        return batch
+    
+    def _write(self, batch: List[dict]) -> None:
+        """Write a batch, retrying it, then falling back to row by row so a bad row loses only itself"""
+        for attempt in range(1, self.retries + 1):
+            try:
+                self._insert(batch)
+                return
+            except Exception as e:
+                logger.warning(f"Error writing {len(batch)} queued contact messages (attempt {attempt}): {e}")
+                time.sleep(self.interval * attempt)
+        for row in batch:
+            try:
+                self._insert([row])
+            except Exception as e:
+                logger.error(f"Dropping queued contact message {row!r}: {e}")
+    
+    def _insert(self, rows: List[dict]) -> None:
+        """One executemany INSERT per set of keys and one commit; rolls back and raises on failure"""
+        # An executemany is compiled from its first row, so rows setting other columns go separately
+        by_keys = {}
+        for row in rows:
+            by_keys.setdefault(frozenset(row), []).append(row)
+        with self.session_factory() as session, session.begin():
+            for group in by_keys.values():
+                session.execute(
+                    insert(ContactMessage).execution_options(insertmanyvalues_page_size=self.batch_size),
+                    group
+                )
+
+contact_message_writer = ContactMessageWriter(
+    batch_size=int(os.getenv('CONTACT_WRITE_BATCH_SIZE', '50')),
+    interval=float(os.getenv('CONTACT_WRITE_INTERVAL', '0.2'))
+)
@@ -1,27 +1,47 @@
 """
 Product and Service Operations
 """
-from sqlalchemy.orm import joinedload
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, load_only, noload, raiseload, selectinload
+from sqlalchemy import RowMapping, and_, select, update
 from sqlalchemy.sql import func
 from database.models.product_models import DigitalProduct, TradingService, ServiceBooking
-from .base_service import BaseService
-from typing import Optional, List
+from .base_service import BaseService, invalidate_lists_on_write
+from typing import Iterator, Optional, List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Homepage lists; served from the process-local list cache
+invalidate_lists_on_write(DigitalProduct, TradingService)
+
 class ProductService(BaseService[DigitalProduct]):
     """Service for product and trading service operations"""
     
-    def __init__(self):
-        super().__init__(DigitalProduct)
+    def __init__(self, session: Optional[Session] = None):
+        super().__init__(DigitalProduct, session)
     
     # Digital Product operations
     def get_active_products(self, skip: int = 0, limit: int = 10) -> List[DigitalProduct]:
         """Get active digital products"""
         try:
-            return self.db.query(DigitalProduct).offset(skip).limit(limit).all()
+            stmt = select(DigitalProduct).options(*self._list_options(DigitalProduct)).order_by(
+                DigitalProduct.id
+            ).offset(skip).limit(limit)
+            return self._cached_list(DigitalProduct, ('active', skip, limit), stmt)
+        except Exception as e:
+            logger.error(f"Error getting active products: {e}")
+            raise
+    
+    def get_active_products_summary(self, skip: int = 0, limit: int = 10) -> List[RowMapping]:
+        """Get the listing columns of active digital products as read-only mappings"""
+        try:
+            # Plain rows: no description text shipped, no ORM identity or state per row
+            return self.db.execute(
+                select(
+                    DigitalProduct.id, DigitalProduct.name, DigitalProduct.price,
+                    DigitalProduct.created_at
+                ).order_by(DigitalProduct.id).offset(skip).limit(limit)
+            ).mappings().all()
         except Exception as e:
             logger.error(f"Error getting active products: {e}")
             raise
@@ -30,22 +50,50 @@ class ProductService(BaseService[DigitalProduct]):
     def get_active_services(self, skip: int = 0, limit: int = 10) -> List[TradingService]:
         """Get active trading services"""
         try:
-            return self.db.query(TradingService).filter(
+            return self.db.query(TradingService).options(*self._list_options(TradingService)).filter(
                 TradingService.is_active == True
             ).order_by(TradingService.display_order.asc()).offset(skip).limit(limit).all()
         except Exception as e:
             logger.error(f"Error getting active services: {e}")
             raise
     
+    def get_active_services_summary(self, skip: int = 0, limit: int = 10) -> List[RowMapping]:
+        """Get the listing columns of active trading services as read-only mappings"""
+        try:
+            # Skips the description, features JSON and SEO columns a listing never shows
+            return self.db.execute(
+                select(
+                    TradingService.id, TradingService.name, TradingService.slug,
+                    TradingService.service_type, TradingService.price, TradingService.currency,
+                    TradingService.is_featured, TradingService.display_order
+                ).where(
+                    TradingService.is_active == True
+                ).order_by(TradingService.display_order.asc()).offset(skip).limit(limit)
+            ).mappings().all()
+        except Exception as e:
+            logger.error(f"Error getting active services: {e}")
+            raise
+    
+    def get_active_services_page(self, cursor: Optional[tuple] = None,
+                                 limit: int = 10) -> Tuple[List[TradingService], Optional[tuple]]:
+        """Get a keyset page of active trading services in display order"""
+        try:
+            return self._seek_page(
+                self.db.query(TradingService).options(*self._list_options(TradingService)).filter(TradingService.is_active == True),
+                TradingService.display_order, cursor, limit, descending=False
+            )
+        except Exception as e:
+            logger.error(f"Error getting active services: {e}")
+            raise
+    
     def get_featured_services(self, limit: int = 5) -> List[TradingService]:
         """Get featured trading services"""
         try:
-            return self.db.query(TradingService).filter(
-                and_(
-                    TradingService.is_featured == True,
-                    TradingService.is_active == True
-                )
-            ).order_by(TradingService.display_order.asc()).limit(limit).all()
+            stmt = select(TradingService).options(*self._list_options(TradingService)).where(
+                TradingService.is_featured == True,
+                TradingService.is_active == True
+            ).order_by(TradingService.display_order.asc()).limit(limit)
+            return self._cached_list(TradingService, ('featured', limit), stmt)
         except Exception as e:
             logger.error(f"Error getting featured services: {e}")
             raise
@@ -53,12 +101,11 @@ class ProductService(BaseService[DigitalProduct]):
     def get_popular_services(self, limit: int = 5) -> List[TradingService]:
         """Get popular trading services"""
         try:
-            return self.db.query(TradingService).filter(
-                and_(
-                    TradingService.is_popular == True,
-                    TradingService.is_active == True
-                )
-            ).order_by(TradingService.display_order.asc()).limit(limit).all()
+            stmt = select(TradingService).options(*self._list_options(TradingService)).where(
+                TradingService.is_popular == True,
+                TradingService.is_active == True
+            ).order_by(TradingService.display_order.asc()).limit(limit)
+            return self._cached_list(TradingService, ('popular', limit), stmt)
         except Exception as e:
             logger.error(f"Error getting popular services: {e}")
             raise
@@ -67,7 +114,28 @@ class ProductService(BaseService[DigitalProduct]):
         """Get trading service by slug"""
         try:
             return self.db.query(TradingService).options(
-                joinedload(TradingService.bookings)
+                # A joined collection would repeat the service row per booking
+                selectinload(TradingService.bookings),
+                # Anything else the caller touches should fail loudly, not lazy-load
+                raiseload('*')
+            ).filter(TradingService.slug == slug).first()
+        except Exception as e:
+            logger.error(f"Error getting service by slug {slug}: {e}")
+            raise
+    
+    def get_service_by_slug_light(self, slug: str) -> Optional[TradingService]:
+        """Get trading service by slug with only its display columns, no bookings"""
+        try:
+            return self.db.query(TradingService).options(
+                load_only(
+                    TradingService.name, TradingService.slug, TradingService.service_type,
+                    TradingService.description, TradingService.price, TradingService.currency,
+                    TradingService.duration, TradingService.features, TradingService.booking_type,
+                    TradingService.contact_info, TradingService.booking_url,
+                    TradingService.meta_title, TradingService.meta_description,
+                    raiseload=True
+                ),
+                raiseload('*')
             ).filter(TradingService.slug == slug).first()
         except Exception as e:
             logger.error(f"Error getting service by slug {slug}: {e}")
@@ -76,7 +144,7 @@ class ProductService(BaseService[DigitalProduct]):
     def get_services_by_type(self, service_type: str, skip: int = 0, limit: int = 10) -> List[TradingService]:
         """Get services by type"""
         try:
-            return self.db.query(TradingService).filter(
+            return self.db.query(TradingService).options(*self._list_options(TradingService)).filter(
                 and_(
                     TradingService.service_type == service_type,
                     TradingService.is_active == True
@@ -95,8 +163,7 @@ class ProductService(BaseService[DigitalProduct]):
                 **booking_data
             )
             self.db.add(booking)
-            self.db.commit()
-            self.db.refresh(booking)
+            self._commit()
             return booking
         except Exception as e:
             self.db.rollback()
@@ -106,39 +173,67 @@ class ProductService(BaseService[DigitalProduct]):
     def get_service_bookings(self, service_id: int) -> List[ServiceBooking]:
         """Get all bookings for a service"""
         try:
-            return self.db.query(ServiceBooking).filter(
+            return self.db.query(ServiceBooking).options(*self._list_options(ServiceBooking)).filter(
                 ServiceBooking.service_id == service_id
             ).order_by(ServiceBooking.created_at.desc()).all()
         except Exception as e:
             logger.error(f"Error getting bookings for service {service_id}: {e}")
             raise
     
+    def get_service_bookings_stream(self, service_id: int, batch_size: int = 500) -> Iterator[ServiceBooking]:
+        """Stream a service's bookings, newest first, batch_size rows at a time (service left unloaded)"""
+        try:
+            yield from self._stream(
+                # The mapped selectin load would query the connection the open cursor is still reading
+                select(ServiceBooking).options(noload(ServiceBooking.service)).where(
+                    ServiceBooking.service_id == service_id
+                ).order_by(ServiceBooking.created_at.desc()),
+                batch_size
+            )
+        except Exception as e:
+            logger.error(f"Error getting bookings for service {service_id}: {e}")
+            raise
+    
     def get_pending_bookings(self) -> List[ServiceBooking]:
         """Get pending service bookings"""
         try:
-            return self.db.query(ServiceBooking).filter(
+            return self.db.query(ServiceBooking).options(*self._list_options(ServiceBooking)).filter(
                 ServiceBooking.status == 'pending'
             ).order_by(ServiceBooking.created_at.desc()).all()
         except Exception as e:
             logger.error(f"Error getting pending bookings: {e}")
             raise
     
+    def get_pending_bookings_summary(self) -> List[RowMapping]:
+        """Get the listing columns of pending service bookings as read-only mappings"""
+        try:
+            # No message/notes text and no selectin load of each booking's service
+            return self.db.execute(
+                select(
+                    ServiceBooking.id, ServiceBooking.service_id, ServiceBooking.name,
+                    ServiceBooking.email, ServiceBooking.phone,
+                    ServiceBooking.preferred_contact_method, ServiceBooking.created_at
+                ).where(
+                    ServiceBooking.status == 'pending'
+                ).order_by(ServiceBooking.created_at.desc())
+            ).mappings().all()
+        except Exception as e:
+            logger.error(f"Error getting pending bookings: {e}")
+            raise
+    
     def update_booking_status(self, booking_id: int, status: str, notes: str = None) -> bool:
         """Update booking status"""
         try:
-            booking = self.db.query(ServiceBooking).filter(
-                ServiceBooking.id == booking_id
-            ).first()
-            
-            if booking:
-                booking.status = status
-                if notes:
-                    booking.admin_notes = notes
-                if status == 'contacted':
-                    booking.contacted_at = func.now()
-                self.db.commit()
-                return True
-            return False
+            values = {'status': status}
+            if notes:
+                values['admin_notes'] = notes
+            if status == 'contacted':
+                values['contacted_at'] = func.now()
+            result = self.db.execute(
+                update(ServiceBooking).where(ServiceBooking.id == booking_id).values(**values)
+            )
+            self._commit()
+            return result.rowcount > 0
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error updating booking {booking_id} status: {e}")
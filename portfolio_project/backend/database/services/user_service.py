@@ -1,7 +1,9 @@
 """
 User Service for Database Operations
 """
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.sql import func
 from database.models.user_models import User, UserProfile
 from database.models.achievement_models import Achievement
 from database.models.payment_models import PurchasedCourse
@@ -11,16 +13,20 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Auth lookups run on every request; built once so each call only binds its value
+USER_BY_USERNAME = select(User).where(User.username == bindparam('username')).limit(1)
+USER_BY_EMAIL = select(User).where(func.lower(User.email) == func.lower(bindparam('email'))).limit(1)
+
 class UserService(BaseService[User]):
     """Service for user-related database operations"""
     
-    def __init__(self):
-        super().__init__(User)
+    def __init__(self, session: Optional[Session] = None):
+        super().__init__(User, session)
     
     def get_by_username(self, username: str) -> Optional[User]:
         """Get user by username"""
         try:
-            return self.db.query(User).filter(User.username == username).first()
+            return self.db.execute(USER_BY_USERNAME, {'username': username}).scalars().first()
         except Exception as e:
             logger.error(f"Error getting user by username {username}: {e}")
             raise
@@ -28,7 +34,7 @@ class UserService(BaseService[User]):
     def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
         try:
-            return self.db.query(User).filter(User.email == email).first()
+            return self.db.execute(USER_BY_EMAIL, {'email': email}).scalars().first()
         except Exception as e:
             logger.error(f"Error getting user by email {email}: {e}")
             raise
@@ -43,15 +49,11 @@ class UserService(BaseService[User]):
                 **kwargs
             )
             user.set_password(password)
+            # The unit of work inserts the user, then the profile with its new id, in one flush
+            user.profile = UserProfile()
             self.db.add(user)
-            self.db.flush()  # Get the user ID
-            
-            # Create user profile
-            profile = UserProfile(user_id=user.id)
-            self.db.add(profile)
             
-            self.db.commit()
-            self.db.refresh(user)
+            self._commit()
             return user
         except Exception as e:
             self.db.rollback()
@@ -63,6 +65,9 @@ class UserService(BaseService[User]):
         try:
             user = self.get_by_username(username)
             if user and user.check_password(password):
+                # check_password may have upgraded the stored hash to Argon2
+                if self.db.is_modified(user):
+                    self._commit()
                 return user
             return None
         except Exception as e:
@@ -72,9 +77,8 @@ class UserService(BaseService[User]):
     def get_user_with_profile(self, user_id: int) -> Optional[User]:
         """Get user with profile data"""
         try:
-            return self.db.query(User).options(
-                joinedload(User.profile)
-            ).filter(User.id == user_id).first()
+            # User.profile is mapped lazy='joined'; get() skips SQL on an identity-map hit
+            return self.db.get(User, user_id)
         except Exception as e:
             logger.error(f"Error getting user with profile {user_id}: {e}")
             raise
@@ -90,7 +94,7 @@ class UserService(BaseService[User]):
                 for key, value in profile_data.items():
                     if hasattr(profile, key):
                         setattr(profile, key, value)
-                self.db.commit()
+                self._commit()
                 self.db.refresh(profile)
             
             return profile
@@ -102,7 +106,9 @@ class UserService(BaseService[User]):
     def get_user_achievements(self, user_id: int) -> List[Achievement]:
         """Get user achievements"""
         try:
-            return self.db.query(Achievement).filter(
+            return self.db.query(Achievement).options(
+                selectinload(Achievement.user)
+            ).filter(
                 Achievement.user_id == user_id
             ).order_by(Achievement.date.desc()).all()
         except Exception as e:
@@ -119,15 +125,16 @@ class UserService(BaseService[User]):
             logger.error(f"Error getting courses for user {user_id}: {e}")
             raise
     
+    def _set_active(self, user_id: int, is_active: bool) -> bool:
+        """Flip is_active with a single UPDATE; False if the user doesn't exist"""
+        result = self.db.execute(update(User).where(User.id == user_id).values(is_active=is_active))
+        self._commit()
+        return result.rowcount > 0
+    
     def deactivate_user(self, user_id: int) -> bool:
         """Deactivate user account"""
         try:
-            user = self.get(user_id)
-            if user:
-                user.is_active = False
-                self.db.commit()
-                return True
-            return False
+            return self._set_active(user_id, False)
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error deactivating user {user_id}: {e}")
@@ -136,12 +143,7 @@ class UserService(BaseService[User]):
     def activate_user(self, user_id: int) -> bool:
         """Activate user account"""
         try:
-            user = self.get(user_id)
-            if user:
-                user.is_active = True
-                self.db.commit()
-                return True
-            return False
+            return self._set_active(user_id, True)
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error activating user {user_id}: {e}")
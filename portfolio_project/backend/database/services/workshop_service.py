@@ -1,39 +1,54 @@
 """
 Workshop Service for Database Operations
 """
-from sqlalchemy.orm import joinedload
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, joinedload, lazyload, noload, selectinload
+from sqlalchemy import and_, exists, select, update
+from sqlalchemy.sql import func
 from database.models.workshop_models import Workshop, WorkshopApplication
-from .base_service import BaseService
-from typing import Optional, List
-from datetime import datetime
+from .base_service import BaseService, invalidate_list_cache_on_commit, invalidate_lists_on_write
+from typing import Iterator, Optional, List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Featured workshops render on the homepage; served from the process-local list cache
+invalidate_lists_on_write(Workshop)
+
 class WorkshopService(BaseService[Workshop]):
     """Service for workshop-related database operations"""
     
-    def __init__(self):
-        super().__init__(Workshop)
+    def __init__(self, session: Optional[Session] = None):
+        super().__init__(Workshop, session)
     
     def get_active_workshops(self, skip: int = 0, limit: int = 10) -> List[Workshop]:
         """Get active workshops"""
         try:
-            return self.db.query(Workshop).filter(
+            return self.db.query(Workshop).options(*self._list_options(Workshop)).filter(
                 Workshop.is_active == True
             ).order_by(Workshop.start_date.desc()).offset(skip).limit(limit).all()
         except Exception as e:
             logger.error(f"Error getting active workshops: {e}")
             raise
     
+    def get_active_workshops_page(self, cursor: Optional[tuple] = None,
+                                  limit: int = 10) -> Tuple[List[Workshop], Optional[tuple]]:
+        """Get a keyset page of active workshops, latest start first"""
+        try:
+            return self._seek_page(
+                self.db.query(Workshop).options(*self._list_options(Workshop)).filter(Workshop.is_active == True),
+                Workshop.start_date, cursor, limit
+            )
+        except Exception as e:
+            logger.error(f"Error getting active workshops: {e}")
+            raise
+    
     def get_upcoming_workshops(self, skip: int = 0, limit: int = 10) -> List[Workshop]:
         """Get upcoming workshops"""
         try:
-            return self.db.query(Workshop).filter(
+            return self.db.query(Workshop).options(*self._list_options(Workshop)).filter(
                 and_(
                     Workshop.is_active == True,
-                    Workshop.start_date > datetime.now(),
+                    Workshop.is_upcoming,
                     Workshop.status == 'upcoming'
                 )
             ).order_by(Workshop.start_date.asc()).offset(skip).limit(limit).all()
@@ -44,12 +59,11 @@ class WorkshopService(BaseService[Workshop]):
     def get_featured_workshops(self, limit: int = 5) -> List[Workshop]:
         """Get featured workshops"""
         try:
-            return self.db.query(Workshop).filter(
-                and_(
-                    Workshop.is_featured == True,
-                    Workshop.is_active == True
-                )
-            ).order_by(Workshop.start_date.asc()).limit(limit).all()
+            stmt = select(Workshop).options(*self._list_options(Workshop)).where(
+                Workshop.is_featured == True,
+                Workshop.is_active == True
+            ).order_by(Workshop.start_date.asc()).limit(limit)
+            return self._cached_list(Workshop, ('featured', limit), stmt)
         except Exception as e:
             logger.error(f"Error getting featured workshops: {e}")
             raise
@@ -59,7 +73,8 @@ class WorkshopService(BaseService[Workshop]):
         try:
             return self.db.query(Workshop).options(
                 joinedload(Workshop.instructor),
-                joinedload(Workshop.applications)
+                # A joined collection would repeat the workshop row per application
+                selectinload(Workshop.applications)
             ).filter(Workshop.slug == slug).first()
         except Exception as e:
             logger.error(f"Error getting workshop by slug {slug}: {e}")
@@ -68,7 +83,7 @@ class WorkshopService(BaseService[Workshop]):
     def get_paid_workshops(self, skip: int = 0, limit: int = 10) -> List[Workshop]:
         """Get paid workshops"""
         try:
-            return self.db.query(Workshop).filter(
+            return self.db.query(Workshop).options(*self._list_options(Workshop)).filter(
                 and_(
                     Workshop.is_paid == True,
                     Workshop.is_active == True
@@ -81,7 +96,7 @@ class WorkshopService(BaseService[Workshop]):
     def get_free_workshops(self, skip: int = 0, limit: int = 10) -> List[Workshop]:
         """Get free workshops"""
         try:
-            return self.db.query(Workshop).filter(
+            return self.db.query(Workshop).options(*self._list_options(Workshop)).filter(
                 and_(
                     Workshop.is_paid == False,
                     Workshop.is_active == True
@@ -100,56 +115,117 @@ class WorkshopService(BaseService[Workshop]):
                 **application_data
             )
             self.db.add(application)
-            self.db.commit()
-            self.db.refresh(application)
+            self._commit()
             return application
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error creating workshop application: {e}")
             raise
     
+    def create_applications_bulk(self, workshop_id: int, applications: List[dict]) -> int:
+        """Create many applications for one workshop in multi-row INSERTs; returns the row count"""
+        try:
+            count = self._insert_many(WorkshopApplication, [
+                {**application_data, 'workshop_id': workshop_id}
+                for application_data in applications
+            ])
+            self._commit()
+            return count
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error bulk creating applications for workshop {workshop_id}: {e}")
+            raise
+    
+    def try_register(self, workshop_id: int) -> bool:
+        """Take one seat if the workshop has space (one guarded UPDATE; caller commits)"""
+        result = self.db.execute(
+            update(Workshop).where(
+                Workshop.id == workshop_id,
+                Workshop.registered_count < Workshop.max_participants
+            ).values(registered_count=Workshop.registered_count + 1)
+        )
+        if result.rowcount != 1:
+            return False
+        # A Core UPDATE skips the mapper events, so clear the cached lists showing seat counts
+        invalidate_list_cache_on_commit(self.db, Workshop)
+        return True
+    
     def get_application_by_email(self, workshop_id: int, email: str) -> Optional[WorkshopApplication]:
         """Get application by workshop and email"""
         try:
             return self.db.query(WorkshopApplication).filter(
                 and_(
                     WorkshopApplication.workshop_id == workshop_id,
-                    WorkshopApplication.email == email
+                    func.lower(WorkshopApplication.email) == func.lower(email)
                 )
             ).first()
         except Exception as e:
             logger.error(f"Error getting application for workshop {workshop_id} and email {email}: {e}")
             raise
     
+    def application_exists(self, workshop_id: int, email: str) -> bool:
+        """Check whether an email has already applied to a workshop"""
+        try:
+            # SELECT EXISTS(...) stops at the first match and builds no object
+            return bool(self.db.scalar(select(exists().where(
+                WorkshopApplication.workshop_id == workshop_id,
+                func.lower(WorkshopApplication.email) == func.lower(email)
+            ))))
+        except Exception as e:
+            logger.error(f"Error checking application for workshop {workshop_id} and email {email}: {e}")
+            raise
+    
     def get_workshop_applications(self, workshop_id: int) -> List[WorkshopApplication]:
         """Get all applications for a workshop"""
         try:
-            return self.db.query(WorkshopApplication).filter(
+            return self.db.query(WorkshopApplication).options(*self._list_options(WorkshopApplication)).filter(
                 WorkshopApplication.workshop_id == workshop_id
             ).order_by(WorkshopApplication.applied_at.desc()).all()
         except Exception as e:
             logger.error(f"Error getting applications for workshop {workshop_id}: {e}")
             raise
     
+    def get_workshop_applications_stream(self, workshop_id: int,
+                                         batch_size: int = 500) -> Iterator[WorkshopApplication]:
+        """Stream a workshop's applications, newest first, batch_size rows at a time (workshop left unloaded)"""
+        try:
+            yield from self._stream(
+                # The mapped selectin load would query the connection the open cursor is still reading
+                select(WorkshopApplication).options(noload(WorkshopApplication.workshop)).where(
+                    WorkshopApplication.workshop_id == workshop_id
+                ).order_by(WorkshopApplication.applied_at.desc()),
+                batch_size
+            )
+        except Exception as e:
+            logger.error(f"Error getting applications for workshop {workshop_id}: {e}")
+            raise
+    
     def approve_application(self, application_id: int) -> bool:
         """Approve workshop application"""
         try:
-            application = self.db.query(WorkshopApplication).filter(
-                WorkshopApplication.id == application_id
-            ).first()
-            
-            if application and application.status == 'pending':
-                # Check if workshop has space
-                workshop = application.workshop
-                if workshop.registered_count < workshop.max_participants:
-                    application.status = 'approved'
-                    workshop.registered_count += 1
-                    self.db.commit()
-                    return True
-                else:
-                    application.status = 'waitlist'
-                    self.db.commit()
-                    return False
+            workshop_id = self.db.scalar(
+                select(WorkshopApplication.workshop_id).where(WorkshopApplication.id == application_id)
+            )
+            if workshop_id is None:
+                return False
+            # Claim the pending application first, so two concurrent approvals can't both take a seat
+            claimed = self.db.execute(
+                update(WorkshopApplication).where(
+                    WorkshopApplication.id == application_id,
+                    WorkshopApplication.status == 'pending'
+                ).values(status='approved')
+            ).rowcount
+            if not claimed:
+                return False
+            if self.try_register(workshop_id):
+                self._commit()
+                return True
+            self.db.execute(
+                update(WorkshopApplication).where(
+                    WorkshopApplication.id == application_id
+                ).values(status='waitlist')
+            )
+            self._commit()
             return False
         except Exception as e:
             self.db.rollback()
@@ -159,15 +235,17 @@ class WorkshopService(BaseService[Workshop]):
     def reject_application(self, application_id: int, reason: str = None) -> bool:
         """Reject workshop application"""
         try:
-            application = self.db.query(WorkshopApplication).filter(
-                WorkshopApplication.id == application_id
-            ).first()
+            application = self.db.get(
+                WorkshopApplication, application_id,
+                # Status changes never read the workshop row; skip the mapped selectin load
+                options=[lazyload(WorkshopApplication.workshop)]
+            )
             
             if application:
                 application.status = 'rejected'
                 if reason:
                     application.notes = reason
-                self.db.commit()
+                self._commit()
                 return True
             return False
         except Exception as e:
@@ -178,12 +256,12 @@ class WorkshopService(BaseService[Workshop]):
     def update_workshop_status(self, workshop_id: int, status: str) -> bool:
         """Update workshop status"""
         try:
-            workshop = self.get(workshop_id)
-            if workshop:
-                workshop.status = status
-                self.db.commit()
-                return True
-            return False
+            result = self.db.execute(
+                update(Workshop).where(Workshop.id == workshop_id).values(status=status)
+            )
+            invalidate_list_cache_on_commit(self.db, Workshop)
+            self._commit()
+            return result.rowcount > 0
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error updating workshop {workshop_id} status: {e}")
@@ -5,20 +5,33 @@ This module handles syncing data from Django models to SQLAlchemy analytics mode
 from django.contrib.auth.models import User
 from portfolio_app.models import (
     UserProfile, Workshop, WorkshopApplication, BlogPost, 
-    Newsletter, TradingService, Payment, PurchasedCourse
+    TradingService, Payment
 )
+from database.analytics import invalidate_analytics_cache
 from database.config import SessionLocal
 from database.models import (
     UserAnalytics, WorkshopAnalytics, ContentAnalytics, 
-    RevenueAnalytics, NewsletterAnalytics, TradingServiceAnalytics
+    RevenueAnalytics, RevenueWeeklyRollup, NewsletterAnalytics, TradingServiceAnalytics,
+    UserBehaviorLog, UserBehaviorHourly, Newsletter
 )
-from django.db.models import Sum, Count, Avg
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from django.db.models import Sum, Count, Avg, Q, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from datetime import datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+SYNC_BATCH_SIZE = int(os.getenv('ANALYTICS_SYNC_BATCH_SIZE', '500'))
+
+def to_cents(amount: Decimal) -> int:
+    """Convert a currency amount to integer cents (paise), rounding half up"""
+    return int((Decimal(amount) * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
 class DataSyncManager:
     """Manages data synchronization between Django and SQLAlchemy"""
     
@@ -31,50 +44,70 @@ class DataSyncManager:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.db.close()
     
+    def _bulk_upsert(self, model, key, rows, **filters):
+        """Insert or update analytics rows matched on key, in executemany batches.
+        
+        Rows are plain dicts sent as Core executemany statements, so no ORM
+        instances, identity map entries or autoflushes are involved.
+        """
+        key_column = getattr(model, key)
+        # One query for every existing row instead of a SELECT per record
+        existing = dict(self.db.execute(
+            select(key_column, model.id).where(
+                *(getattr(model, column) == value for column, value in filters.items())
+            )
+        ).all())
+        
+        inserts = [{**filters, **row} for row in rows if row[key] not in existing]
+        updates = [{**row, 'id': existing[row[key]]} for row in rows if row[key] in existing]
+        
+        for start in range(0, len(inserts), SYNC_BATCH_SIZE):
+            self.db.execute(insert(model), inserts[start:start + SYNC_BATCH_SIZE])
+        for start in range(0, len(updates), SYNC_BATCH_SIZE):
+            self.db.execute(update(model), updates[start:start + SYNC_BATCH_SIZE])
+    
     def sync_user_analytics(self):
         """Sync user data to analytics"""
         try:
-            users = User.objects.select_related('profile').all()
+            # Engagement counts for every user in two queries instead of three per user
+            users = User.objects.select_related('profile').annotate(
+                course_count=Count('purchased_courses'),
+                course_spend=Sum('purchased_courses__amount_paid')
+            )
+            attended_by_email = dict(
+                WorkshopApplication.objects.filter(status='approved')
+                .values('email')
+                .annotate(attended=Count('id'))
+                .values_list('email', 'attended')
+            )
+            rows = []
             
             for user in users:
-                # Get or create user analytics record
-                user_analytics = self.db.query(UserAnalytics).filter(
-                    UserAnalytics.user_id == user.id
-                ).first()
-                
-                if not user_analytics:
-                    user_analytics = UserAnalytics(user_id=user.id)
-                    self.db.add(user_analytics)
-                
-                # Update user data
-                user_analytics.username = user.username
-                user_analytics.email = user.email
-                user_analytics.registration_date = user.date_joined
-                user_analytics.last_login = user.last_login
+                row = {
+                    'user_id': user.id,
+                    'username': user.username,
+                    'email': user.email,
+                    'registration_date': user.date_joined,
+                    'last_login': user.last_login
+                }
                 
                 # Update profile data if exists
                 if hasattr(user, 'profile'):
                     profile = user.profile
-                    user_analytics.trading_experience = profile.trading_experience
-                    user_analytics.preferred_market = profile.preferred_market
-                
-                # Calculate engagement metrics
-                purchased_courses = PurchasedCourse.objects.filter(user=user)
-                user_analytics.courses_purchased = purchased_courses.count()
-                user_analytics.total_spent = purchased_courses.aggregate(
-                    total=Sum('amount_paid')
-                )['total'] or 0
+                    row['trading_experience'] = profile.trading_experience
+                    row['preferred_market'] = profile.preferred_market
                 
-                # Workshop attendance
-                workshop_apps = WorkshopApplication.objects.filter(
-                    email=user.email, status='approved'
-                )
-                user_analytics.workshops_attended = workshop_apps.count()
+                # Engagement metrics
+                row['courses_purchased'] = user.course_count
+                row['total_spent'] = user.course_spend or 0
+                row['workshops_attended'] = attended_by_email.get(user.email, 0)
                 
-                user_analytics.updated_at = datetime.now()
+                rows.append(row)
             
+            self._bulk_upsert(UserAnalytics, 'user_id', rows)
             self.db.commit()
-            logger.info(f"Synced {users.count()} user analytics records")
+            invalidate_analytics_cache()
+            logger.info(f"Synced {len(rows)} user analytics records")
             
         except Exception as e:
             self.db.rollback()
@@ -84,42 +117,38 @@ class DataSyncManager:
     def sync_workshop_analytics(self):
         """Sync workshop performance data"""
         try:
-            workshops = Workshop.objects.all()
+            # Application metrics in the same query as the workshops (one grouped scan)
+            workshops = Workshop.objects.annotate(
+                registrations=Count('applications'),
+                confirmed=Count('applications', filter=Q(applications__status='approved')),
+                paid_revenue=Sum(
+                    'applications__payment_amount',
+                    filter=Q(applications__payment_status='completed')
+                )
+            )
+            rows = []
             
             for workshop in workshops:
-                # Get or create workshop analytics record
-                workshop_analytics = self.db.query(WorkshopAnalytics).filter(
-                    WorkshopAnalytics.workshop_id == workshop.id
-                ).first()
-                
-                if not workshop_analytics:
-                    workshop_analytics = WorkshopAnalytics(workshop_id=workshop.id)
-                    self.db.add(workshop_analytics)
-                
-                # Update workshop data
-                workshop_analytics.workshop_title = workshop.title
-                workshop_analytics.workshop_type = 'paid' if workshop.is_paid else 'free'
-                workshop_analytics.workshop_date = workshop.start_date
-                
-                # Calculate metrics from applications
-                applications = WorkshopApplication.objects.filter(workshop=workshop)
-                workshop_analytics.total_registrations = applications.count()
-                workshop_analytics.confirmed_attendees = applications.filter(
-                    status='approved'
-                ).count()
+                row = {
+                    'workshop_id': workshop.id,
+                    'workshop_title': workshop.title,
+                    'workshop_type': 'paid' if workshop.is_paid else 'free',
+                    'workshop_date': workshop.start_date,
+                    'total_registrations': workshop.registrations,
+                    'confirmed_attendees': workshop.confirmed
+                }
                 
                 # Revenue calculations for paid workshops
                 if workshop.is_paid:
-                    paid_applications = applications.filter(payment_status='completed')
-                    workshop_analytics.revenue_generated = paid_applications.aggregate(
-                        total=Sum('payment_amount')
-                    )['total'] or 0
-                    workshop_analytics.average_ticket_price = workshop.price or 0
+                    row['revenue_generated'] = workshop.paid_revenue or 0
+                    row['average_ticket_price'] = workshop.price or 0
                 
-                workshop_analytics.updated_at = datetime.now()
+                rows.append(row)
             
+            self._bulk_upsert(WorkshopAnalytics, 'workshop_id', rows)
             self.db.commit()
-            logger.info(f"Synced {workshops.count()} workshop analytics records")
+            invalidate_analytics_cache()
+            logger.info(f"Synced {len(rows)} workshop analytics records")
             
         except Exception as e:
             self.db.rollback()
@@ -129,43 +158,54 @@ class DataSyncManager:
     def sync_content_analytics(self):
         """Sync blog post and content analytics"""
         try:
-            blog_posts = BlogPost.objects.filter(status='published')
+            blog_posts = BlogPost.objects.filter(status='published').select_related('category')
+            urls = {post.id: post.get_absolute_url() for post in blog_posts}
+            visitors = self._unique_visitors_by_url(urls.values())
+            rows = []
             
             for post in blog_posts:
-                # Get or create content analytics record
-                content_analytics = self.db.query(ContentAnalytics).filter(
-                    ContentAnalytics.content_id == post.id,
-                    ContentAnalytics.content_type == 'blog_post'
-                ).first()
-                
-                if not content_analytics:
-                    content_analytics = ContentAnalytics(
-                        content_id=post.id,
-                        content_type='blog_post'
-                    )
-                    self.db.add(content_analytics)
-                
-                # Update content data
-                content_analytics.title = post.title
-                content_analytics.category = post.category.name if post.category else 'Uncategorized'
-                content_analytics.total_views = post.views_count
-                content_analytics.publish_date = post.publish_date
+                row = {
+                    'content_id': post.id,
+                    'title': post.title,
+                    'category': post.category.name if post.category else 'Uncategorized',
+                    'total_views': post.views_count,
+                    'unique_visitors': visitors.get(urls[post.id], 0),
+                    'publish_date': post.publish_date
+                }
                 
                 # Calculate trending score (simple algorithm)
                 days_since_publish = (timezone.now() - post.publish_date).days
                 if days_since_publish > 0:
-                    content_analytics.trending_score = post.views_count / max(days_since_publish, 1)
+                    row['trending_score'] = post.views_count / max(days_since_publish, 1)
                 
-                content_analytics.updated_at = datetime.now()
+                rows.append(row)
             
+            self._bulk_upsert(ContentAnalytics, 'content_id', rows, content_type='blog_post')
             self.db.commit()
-            logger.info(f"Synced {blog_posts.count()} content analytics records")
+            invalidate_analytics_cache()
+            logger.info(f"Synced {len(rows)} content analytics records")
             
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error syncing content analytics: {e}")
             raise
     
+    def _unique_visitors_by_url(self, urls):
+        """Distinct sessions per page URL from the behavior log's page views"""
+        urls = list(urls)
+        if not urls:
+            return {}
+        # APPROX_COUNT_DISTINCT is TiDB's HyperLogLog estimate: fixed memory per
+        # group and no deduplicating sort, unlike COUNT(DISTINCT ...)
+        return dict(self.db.execute(
+            select(
+                UserBehaviorLog.page_url, func.approx_count_distinct(UserBehaviorLog.session_id)
+            ).where(
+                UserBehaviorLog.action_type == 'page_view',
+                UserBehaviorLog.page_url.in_(urls)
+            ).group_by(UserBehaviorLog.page_url)
+        ).all())
+    
     def sync_revenue_analytics(self, date=None):
         """Sync daily revenue analytics"""
         try:
@@ -191,62 +231,45 @@ class DataSyncManager:
             start_date = datetime.combine(date, datetime.min.time())
             end_date = start_date + timedelta(days=1)
             
-            # Workshop revenue
-            workshop_payments = Payment.objects.filter(
-                payment_type='workshop',
-                status='completed',
-                completed_at__gte=start_date,
-                completed_at__lt=end_date
-            )
-            revenue_analytics.workshop_revenue = workshop_payments.aggregate(
-                total=Sum('amount')
-            )['total'] or 0
-            
-            # Product revenue
-            product_payments = Payment.objects.filter(
-                payment_type='product',
-                status='completed',
-                completed_at__gte=start_date,
-                completed_at__lt=end_date
-            )
-            revenue_analytics.product_revenue = product_payments.aggregate(
-                total=Sum('amount')
-            )['total'] or 0
-            
-            # Service revenue
-            service_payments = Payment.objects.filter(
-                payment_type='service',
+            # Revenue by source in one aggregate scan over the day's completed payments
+            completed = Payment.objects.filter(
                 status='completed',
                 completed_at__gte=start_date,
                 completed_at__lt=end_date
+            ).aggregate(
+                workshop=Coalesce(Sum('amount', filter=Q(payment_type='workshop')), Value(Decimal('0'))),
+                product=Coalesce(Sum('amount', filter=Q(payment_type='product')), Value(Decimal('0'))),
+                service=Coalesce(Sum('amount', filter=Q(payment_type='service')), Value(Decimal('0')))
             )
-            revenue_analytics.service_revenue = service_payments.aggregate(
-                total=Sum('amount')
-            )['total'] or 0
+            revenue_analytics.workshop_revenue_cents = to_cents(completed['workshop'])
+            revenue_analytics.product_revenue_cents = to_cents(completed['product'])
+            revenue_analytics.service_revenue_cents = to_cents(completed['service'])
             
             # Calculate totals
-            revenue_analytics.total_revenue = (
-                revenue_analytics.workshop_revenue +
-                revenue_analytics.product_revenue +
-                revenue_analytics.service_revenue
+            revenue_analytics.total_revenue_cents = (
+                revenue_analytics.workshop_revenue_cents +
+                revenue_analytics.product_revenue_cents +
+                revenue_analytics.service_revenue_cents
             )
             
-            # Transaction metrics
-            all_payments = Payment.objects.filter(
+            # Transaction metrics, also in a single scan
+            transactions = Payment.objects.filter(
                 created_at__gte=start_date,
                 created_at__lt=end_date
+            ).aggregate(
+                total=Count('id'),
+                successful=Count('id', filter=Q(status='completed')),
+                failed=Count('id', filter=Q(status='failed'))
             )
-            revenue_analytics.total_transactions = all_payments.count()
-            revenue_analytics.successful_payments = all_payments.filter(
-                status='completed'
-            ).count()
-            revenue_analytics.failed_payments = all_payments.filter(
-                status='failed'
-            ).count()
+            revenue_analytics.total_transactions = transactions['total']
+            revenue_analytics.successful_payments = transactions['successful']
+            revenue_analytics.failed_payments = transactions['failed']
             
-            revenue_analytics.updated_at = datetime.now()
+            self.db.flush()
+            self._rollup_revenue_week(date)
             
             self.db.commit()
+            invalidate_analytics_cache()
             logger.info(f"Synced revenue analytics for {date}")
             
         except Exception as e:
@@ -254,35 +277,56 @@ class DataSyncManager:
             logger.error(f"Error syncing revenue analytics: {e}")
             raise
     
+    def _rollup_revenue_week(self, date):
+        """Recompute the weekly rollup row for the week containing date"""
+        week_start = date - timedelta(days=date.weekday())
+        totals = self.db.query(
+            func.coalesce(func.sum(RevenueAnalytics.workshop_revenue_cents), 0),
+            func.coalesce(func.sum(RevenueAnalytics.product_revenue_cents), 0),
+            func.coalesce(func.sum(RevenueAnalytics.service_revenue_cents), 0),
+            func.coalesce(func.sum(RevenueAnalytics.total_revenue_cents), 0),
+            func.coalesce(func.sum(RevenueAnalytics.total_transactions), 0)
+        ).filter(
+            RevenueAnalytics.date >= week_start,
+            RevenueAnalytics.date < week_start + timedelta(days=7)
+        ).one()
+        
+        self.db.merge(RevenueWeeklyRollup(
+            week_start=week_start,
+            year=week_start.isocalendar()[0],
+            week=week_start.isocalendar()[1],
+            workshop_revenue_cents=totals[0],
+            product_revenue_cents=totals[1],
+            service_revenue_cents=totals[2],
+            total_revenue_cents=totals[3],
+            total_transactions=totals[4]
+        ))
+    
     def sync_newsletter_analytics(self):
         """Sync newsletter performance data"""
         try:
-            newsletters = Newsletter.objects.filter(is_sent=True)
+            # Newsletters live in TiDB alongside the analytics, so read them with a projection
+            newsletters = self.db.execute(
+                select(
+                    Newsletter.id, Newsletter.subject, Newsletter.sent_to_count, Newsletter.sent_at
+                ).where(Newsletter.is_sent == True)
+            ).all()
             
-            for newsletter in newsletters:
-                # Get or create newsletter analytics record
-                newsletter_analytics = self.db.query(NewsletterAnalytics).filter(
-                    NewsletterAnalytics.newsletter_id == newsletter.id
-                ).first()
-                
-                if not newsletter_analytics:
-                    newsletter_analytics = NewsletterAnalytics(
-                        newsletter_id=newsletter.id
-                    )
-                    self.db.add(newsletter_analytics)
-                
-                # Update newsletter data
-                newsletter_analytics.subject = newsletter.subject
-                newsletter_analytics.total_sent = newsletter.sent_to_count
-                newsletter_analytics.sent_date = newsletter.sent_at
-                
-                # Note: Actual email metrics would come from your email service provider
-                # This is a placeholder for integration with services like Brevo, Mailchimp, etc.
-                
-                newsletter_analytics.updated_at = datetime.now()
+            # Note: Actual email metrics would come from your email service provider
+            # This is a placeholder for integration with services like Brevo, Mailchimp, etc.
+            rows = [
+                {
+                    'newsletter_id': newsletter.id,
+                    'subject': newsletter.subject,
+                    'total_sent': newsletter.sent_to_count,
+                    'sent_date': newsletter.sent_at
+                }
+                for newsletter in newsletters
+            ]
             
+            self._bulk_upsert(NewsletterAnalytics, 'newsletter_id', rows)
             self.db.commit()
-            logger.info(f"Synced {newsletters.count()} newsletter analytics records")
+            logger.info(f"Synced {len(rows)} newsletter analytics records")
             
         except Exception as e:
             self.db.rollback()
@@ -292,53 +336,70 @@ class DataSyncManager:
     def sync_trading_service_analytics(self):
         """Sync trading service performance data"""
         try:
-            services = TradingService.objects.filter(is_active=True)
+            today = timezone.now().date()
+            # Active subscription count and revenue per service in one grouped query
+            active = Q(purchasedcourse__status='active')
+            services = TradingService.objects.filter(is_active=True).annotate(
+                active_subscribers=Count('purchasedcourse', filter=active),
+                active_revenue=Sum('purchasedcourse__amount_paid', filter=active)
+            )
+            rows = []
             
             for service in services:
-                # Get or create service analytics record for today
-                today = timezone.now().date()
-                service_analytics = self.db.query(TradingServiceAnalytics).filter(
-                    TradingServiceAnalytics.service_id == service.id,
-                    TradingServiceAnalytics.date == today
-                ).first()
-                
-                if not service_analytics:
-                    service_analytics = TradingServiceAnalytics(
-                        service_id=service.id,
-                        date=today
-                    )
-                    self.db.add(service_analytics)
-                
-                # Update service data
-                service_analytics.service_name = service.name
-                service_analytics.service_type = service.service_type
-                
-                # Calculate subscriber metrics from purchased courses
-                active_subscriptions = PurchasedCourse.objects.filter(
-                    trading_service=service,
-                    status='active'
-                )
-                service_analytics.active_subscribers = active_subscriptions.count()
+                # Every row carries the same keys so each batch is a single executemany
+                average_revenue = 0
+                if service.active_subscribers > 0:
+                    average_revenue = (service.active_revenue or 0) / service.active_subscribers
                 
-                # Revenue calculations
-                if service_analytics.active_subscribers > 0:
-                    total_revenue = active_subscriptions.aggregate(
-                        total=Sum('amount_paid')
-                    )['total'] or 0
-                    service_analytics.average_revenue_per_user = (
-                        total_revenue / service_analytics.active_subscribers
-                    )
-                
-                service_analytics.updated_at = datetime.now()
+                rows.append({
+                    'service_id': service.id,
+                    'service_name': service.name,
+                    'service_type': service.service_type,
+                    'active_subscribers': service.active_subscribers,
+                    'average_revenue_per_user': average_revenue
+                })
             
+            self._bulk_upsert(TradingServiceAnalytics, 'service_id', rows, date=today)
             self.db.commit()
-            logger.info(f"Synced {services.count()} trading service analytics records")
+            logger.info(f"Synced {len(rows)} trading service analytics records")
             
         except Exception as e:
             self.db.rollback()
             logger.error(f"Error syncing trading service analytics: {e}")
             raise
     
+    def sync_behavior_rollup(self):
+        """Refresh user_behavior_hourly from the raw behavior log, incrementally"""
+        try:
+            # Recount from the newest rolled-up hour (it may have been partial);
+            # an empty rollup backfills everything still in the log
+            since = self.db.execute(select(func.max(UserBehaviorHourly.hour))).scalar()
+            
+            hour = func.date_format(UserBehaviorLog.timestamp, '%Y-%m-%d %H:00:00')
+            user_id = func.coalesce(UserBehaviorLog.user_id, 0)
+            counts = select(
+                hour, user_id, UserBehaviorLog.action_type, func.count()
+            ).where(
+                UserBehaviorLog.action_type.is_not(None)
+            ).group_by(hour, user_id, UserBehaviorLog.action_type)
+            if since is not None:
+                counts = counts.where(UserBehaviorLog.timestamp >= since)
+            
+            # One INSERT ... SELECT on the server; recounted hours overwrite their old totals
+            stmt = mysql_insert(UserBehaviorHourly).from_select(
+                ['hour', 'user_id', 'action_type', 'n'], counts
+            )
+            result = self.db.execute(stmt.on_duplicate_key_update(n=stmt.inserted.n))
+            
+            self.db.commit()
+            invalidate_analytics_cache()
+            logger.info(f"Rolled up behavior log since {since or 'the beginning'} ({result.rowcount} rows)")
+            
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error rolling up behavior log: {e}")
+            raise
+    
     def full_sync(self):
         """Perform a full synchronization of all analytics data"""
         try:
@@ -350,6 +411,7 @@ class DataSyncManager:
             self.sync_revenue_analytics()
             self.sync_newsletter_analytics()
             self.sync_trading_service_analytics()
+            self.sync_behavior_rollup()
             
             logger.info("Full analytics sync completed successfully")
             
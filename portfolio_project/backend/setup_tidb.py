@@ -35,6 +35,214 @@ def create_tidb_tables():
         print(f"❌ Error creating TiDB tables: {e}")
         return False
 
+# Single-column indexes made redundant by the named indexes in the models
+# (SQLAlchemy's index=True names them ix_<table>_<column>)
+REDUNDANT_INDEXES = {
+    'user_analytics': ['ix_user_analytics_id', 'ix_user_analytics_user_id', 'ix_user_analytics_email'],
+    'workshop_analytics': ['ix_workshop_analytics_id', 'ix_workshop_analytics_workshop_id'],
+    'content_analytics': ['ix_content_analytics_id', 'ix_content_analytics_content_id'],
+    'revenue_analytics': [
+        'ix_revenue_analytics_id', 'ix_revenue_analytics_date', 'ix_revenue_analytics_year',
+        'idx_revenue_analytics_date', 'idx_revenue_analytics_date_covering'
+    ],
+    'newsletter_analytics': ['ix_newsletter_analytics_id', 'ix_newsletter_analytics_newsletter_id'],
+    'trading_service_analytics': [
+        'ix_trading_service_analytics_id', 'ix_trading_service_analytics_service_id',
+        'ix_trading_service_analytics_date',
+        # On a counter the sync rewrites every run, so each update rewrote the index too
+        'idx_trading_service_analytics_revenue'
+    ],
+    # Replaced by flag-leading composites (partial indexes on PostgreSQL)
+    'portfolio_app_blogpost': ['idx_blogpost_status', 'idx_blogpost_featured', 'ix_portfolio_app_blogpost_id'],
+    'portfolio_app_newsletter': ['idx_newsletter_sent', 'ix_portfolio_app_newsletter_id'],
+    # Replaced by lower(email) expression indexes, or shadowed by the primary key,
+    # a unique constraint or a composite index with the same leading column
+    'portfolio_app_payment': [
+        'ix_portfolio_app_payment_id', 'idx_payment_customer_email', 'idx_payment_email_created',
+        'idx_payment_status', 'idx_payment_type'
+    ],
+    'portfolio_app_subscriber': ['ix_portfolio_app_subscriber_id', 'idx_subscriber_email'],
+    'auth_user': [
+        'ix_auth_user_id', 'ix_auth_user_username', 'ix_auth_user_email',
+        'idx_user_email', 'idx_user_username'
+    ],
+    'portfolio_app_userprofile': ['ix_portfolio_app_userprofile_id', 'idx_profile_user'],
+    'portfolio_app_workshopapplication': [
+        'ix_portfolio_app_workshopapplication_id', 'idx_application_email',
+        'idx_application_workshop_email', 'idx_application_workshop'
+    ],
+    'portfolio_app_workshop': ['ix_portfolio_app_workshop_id', 'idx_workshop_active', 'idx_workshop_paid'],
+    'portfolio_app_purchasedcourse': ['ix_portfolio_app_purchasedcourse_id', 'idx_purchased_course_user'],
+    'portfolio_app_servicebooking': [
+        'ix_portfolio_app_servicebooking_id', 'idx_booking_service', 'idx_booking_status'
+    ],
+    'portfolio_app_tradingservice': [
+        'ix_portfolio_app_tradingservice_id', 'idx_service_active', 'idx_service_featured'
+    ],
+    'portfolio_app_digitalproduct': ['ix_portfolio_app_digitalproduct_id'],
+    'portfolio_app_achievement': ['ix_portfolio_app_achievement_id'],
+    'portfolio_app_contactmessage': ['ix_portfolio_app_contactmessage_id', 'idx_contact_status'],
+    'portfolio_app_blogcategory': ['ix_portfolio_app_blogcategory_id'],
+    'portfolio_app_blogtag': ['ix_portfolio_app_blogtag_id'],
+}
+
+# NUMERIC money columns replaced by BIGINT *_cents columns
+CENTS_COLUMNS = {
+    'revenue_analytics': ['workshop_revenue', 'product_revenue', 'service_revenue', 'total_revenue'],
+    'revenue_weekly_rollup': ['workshop_revenue', 'product_revenue', 'service_revenue', 'total_revenue'],
+}
+
+def migrate_revenue_to_cents():
+    """Move existing NUMERIC revenue columns to BIGINT cents columns"""
+    from sqlalchemy import inspect, text
+    inspector = inspect(engine)
+    for table, columns in CENTS_COLUMNS.items():
+        if not inspector.has_table(table):
+            continue
+        existing_columns = {column['name'] for column in inspector.get_columns(table)}
+        legacy = [column for column in columns if column in existing_columns]
+        if not legacy:
+            continue
+        
+        print(f"💱 Converting {table} revenue to cents...")
+        with engine.begin() as connection:
+            # Indexes over the old columns go first; create_missing_indexes() rebuilds them
+            for index in inspector.get_indexes(table):
+                if set(index['column_names']) & set(legacy):
+                    connection.execute(text(f"DROP INDEX {index['name']} ON {table}"))
+            for column in legacy:
+                connection.execute(text(
+                    f"ALTER TABLE {table} ADD COLUMN {column}_cents BIGINT DEFAULT 0"
+                ))
+                connection.execute(text(
+                    f"UPDATE {table} SET {column}_cents = ROUND({column} * 100)"
+                ))
+                connection.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+    return True
+
+def migrate_newsletter_bodies_to_blob():
+    """Turn newsletter body columns created as TEXT into the LONGBLOB the compressed bodies need"""
+    from sqlalchemy import inspect, text
+    inspector = inspect(engine)
+    table = 'portfolio_app_newsletter'
+    if not inspector.has_table(table):
+        return True
+    text_columns = [
+        column['name'] for column in inspector.get_columns(table)
+        if column['name'] in ('content_html', 'content_text') and 'BLOB' not in str(column['type']).upper()
+    ]
+    if not text_columns:
+        return True
+    
+    print(f"🗜️ Converting {table} bodies to LONGBLOB...")
+    with engine.begin() as connection:
+        # Existing rows keep their UTF-8 bytes; CompressedText reads those uncompressed values as-is
+        connection.execute(text(
+            f"ALTER TABLE {table} " + ", ".join(f"MODIFY {column} LONGBLOB" for column in text_columns)
+        ))
+    return True
+
+def maintain_updated_at_columns():
+    """Let TiDB stamp updated_at on analytics tables created before it did (ON UPDATE CURRENT_TIMESTAMP)"""
+    from sqlalchemy import inspect, text
+    inspector = inspect(engine)
+    models = (
+        UserAnalytics, WorkshopAnalytics, ContentAnalytics, RevenueAnalytics, RevenueWeeklyRollup,
+        MarketingCampaignAnalytics, NewsletterAnalytics, TradingServiceAnalytics
+    )
+    with engine.begin() as connection:
+        for model in models:
+            if inspector.has_table(model.__tablename__):
+                # Idempotent: re-running only restates the same column definition
+                connection.execute(text(
+                    f"ALTER TABLE {model.__tablename__} MODIFY updated_at DATETIME "
+                    "DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"
+                ))
+    return True
+
+def create_missing_indexes():
+    """Create model indexes that are missing on tables which already existed"""
+    from sqlalchemy import inspect
+    # create_all() skips existing tables entirely, so indexes added later need this
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            # PostgreSQL-only indexes (GIN on JSONB) don't apply to TiDB
+            if index.dialect_kwargs.get('postgresql_using') and engine.dialect.name != 'postgresql':
+                continue
+            if index.name not in existing:
+                index.create(bind=engine)
+                print(f"  - Created {table.name}.{index.name}")
+    return True
+
+def drop_redundant_indexes():
+    """Drop indexes on existing tables that duplicate a primary key or composite index"""
+    from sqlalchemy import inspect, text
+    print("🧹 Dropping redundant indexes...")
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table, index_names in REDUNDANT_INDEXES.items():
+            if not inspector.has_table(table):
+                continue
+            existing = {index['name'] for index in inspector.get_indexes(table)}
+            for index_name in index_names:
+                if index_name in existing:
+                    connection.execute(text(f"DROP INDEX {index_name} ON {table}"))
+                    print(f"  - Dropped {table}.{index_name}")
+    return True
+
+def maintain_behavior_log_partitions(retention_months=12, lookahead_months=12):
+    """Keep user_behavior_log's monthly partitions covering [now - retention, now + lookahead)"""
+    from datetime import date
+    from sqlalchemy import inspect, text
+    
+    def month_start(months_from_now):
+        today = date.today()
+        month_index = today.year * 12 + today.month - 1 + months_from_now
+        return date(month_index // 12, month_index % 12 + 1, 1)
+    
+    if not inspect(engine).has_table(UserBehaviorLog.__tablename__):
+        return True
+    print("📅 Rolling user_behavior_log partitions...")
+    statements = [
+        # Dropping whole partitions replaces row-by-row DELETEs for retention
+        f"ALTER TABLE user_behavior_log FIRST PARTITION LESS THAN ('{month_start(-retention_months)}')",
+        f"ALTER TABLE user_behavior_log LAST PARTITION LESS THAN ('{month_start(lookahead_months)}')",
+    ]
+    for statement in statements:
+        try:
+            with engine.begin() as connection:
+                connection.execute(text(statement))
+        except Exception as e:
+            # Already at (or past) the requested bound, or not running on TiDB
+            print(f"⚠️  Skipping partition change: {e}")
+    return True
+
+def create_tiflash_replicas():
+    """Add TiFlash columnar replicas for the analytics tables read by the dashboard"""
+    from sqlalchemy import text
+    from database.analytics import DISABLE_COLUMNAR
+    if DISABLE_COLUMNAR:
+        print("⏭️  DISABLE_COLUMNAR set; skipping TiFlash replicas")
+        return True
+    
+    tables = [model.__tablename__ for model in (
+        RevenueAnalytics, WorkshopAnalytics, UserAnalytics, ContentAnalytics
+    )]
+    try:
+        print("🗂️  Creating TiFlash replicas for analytics tables...")
+        with engine.begin() as connection:
+            for table in tables:
+                connection.execute(text(f"ALTER TABLE {table} SET TIFLASH REPLICA 1"))
+        print("✅ TiFlash replicas requested (they sync in the background)")
+    except Exception as e:
+        # Not fatal: plain MySQL/TiDB without TiFlash falls back to row storage
+        print(f"⚠️  Skipping TiFlash replicas: {e}")
+    return True
+
 def sync_django_to_tidb():
     """Sync Django data to TiDB Cloud"""
     try:
@@ -58,6 +266,9 @@ def sync_django_to_tidb():
             
             print("  - Syncing trading service analytics...")
             sync_manager.sync_trading_service_analytics()
+            
+            print("  - Rolling up user behavior log...")
+            sync_manager.sync_behavior_rollup()
         
         print("✅ Data sync completed successfully!")
         return True
@@ -145,6 +356,13 @@ def main():
     # Step 2: Create TiDB tables
     if not create_tidb_tables():
         return False
+    migrate_revenue_to_cents()
+    migrate_newsletter_bodies_to_blob()
+    maintain_updated_at_columns()
+    drop_redundant_indexes()
+    create_missing_indexes()
+    maintain_behavior_log_partitions()
+    create_tiflash_replicas()
     
     # Step 3: Sync data from Django to TiDB
     if not sync_django_to_tidb():